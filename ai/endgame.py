@@ -0,0 +1,354 @@
+"""Endgame databases: the exact value of every position with a few pieces on
+the board, worked out by retrograde analysis. Build them with python -m ai.endgame.
+
+Each material balance (black kings, black men, white kings, white men) has
+an EndgameTable, with a slot for every position given by a perfect index:
+the squares of each kind of piece are ranked as a combination, so the index
+can also be turned back into the position. A slot holds how many plies the
+side to move needs to win (positive), how many it can hold out for before it
+loses (negative), or 0 for a draw.
+
+A table is solved from the positions where the side to move has no move.
+Captures and crownings lead into tables that have fewer pieces or men and
+so were solved before it. Within the table, positions are settled in order
+of distance: won as soon as one move reaches a lost position, lost once
+every move reaches a won one. Whatever is never settled is a draw. An Engine
+given an EndgameDatabase scores the positions it covers instead of searching
+them."""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from array import array
+from functools import cache
+from math import comb
+
+from game.bitboard import iter_bits
+from game.checkers import Checkers
+from util.globalconst import BLACK, COLORS, ENDGAME_DIR, ENDGAME_PIECES, WHITE, WIN_SCORE
+
+BINOMIAL = [[comb(n, k) for k in range(33)] for n in range(33)]
+MAN_SQUARES = 28  # men are never on the row they crown on: black men use bits 0-27, white men bits 4-31
+WHITE_MAN_OFFSET = 4
+# turning the board round maps bit i to bit 31 - i
+_FLIP_BYTE = [int(f"{b:08b}"[::-1], 2) for b in range(256)]
+
+
+def win_value(plies):
+    """Table value of a position the side to move wins in plies."""
+    return plies
+
+
+def loss_value(plies):
+    """Table value of a position the side to move loses in plies."""
+    return -plies - 1
+
+
+def value_plies(value):
+    return value if value > 0 else -value - 1
+
+
+def _rank(bb, taken=0, offset=0):
+    """Rank of the combination of bb's bits, counted from bit offset and
+    skipping the bits in taken."""
+    rank = i = 0
+    while bb:
+        low = bb & -bb
+        i += 1
+        rank += BINOMIAL[low.bit_length() - 1 - offset - (taken & (low - 1)).bit_count()][i]
+        bb ^= low
+    return rank
+
+
+@cache
+def _combinations(n, k):
+    """The masks of every combination of k of the lowest n bits, by _rank."""
+    masks = [sum(1 << b for b in bits) for bits in itertools.combinations(range(n), k)]
+    return tuple(sorted(masks, key=_rank))
+
+
+def _spread(bb, taken):
+    """The inverse of skipping taken in _rank: move bb's bits up past the bits in taken."""
+    spread = 0
+    for b in iter_bits(bb):
+        for t in iter_bits(taken):
+            if t > b:
+                break
+            b += 1
+        spread |= 1 << b
+    return spread
+
+
+def _flip(bb):
+    flip = _FLIP_BYTE
+    return flip[bb & 255] << 24 | flip[bb >> 8 & 255] << 16 | flip[bb >> 16 & 255] << 8 | flip[bb >> 24]
+
+
+def material_of(black, white, kings):
+    """(black kings, black men, white kings, white men) of the masks."""
+    black_kings, white_kings = black & kings, white & kings
+    return (
+        black_kings.bit_count(),
+        (black ^ black_kings).bit_count(),
+        white_kings.bit_count(),
+        (white ^ white_kings).bit_count(),
+    )
+
+
+def materials(max_pieces):
+    """Every material balance with both colors and up to max_pieces pieces,
+    each after those its captures and crownings lead into."""
+    for pieces in range(2, max_pieces + 1):
+        for men in range(pieces + 1):
+            for bm in range(men + 1):
+                for bk in range(pieces - men + 1):
+                    wm, wk = men - bm, pieces - men - bk
+                    if bk + bm and wk + wm:
+                        yield bk, bm, wk, wm
+
+
+class EndgameTable:
+    """Values of the positions of one material balance, either side to move."""
+
+    def __init__(self, material, values=None):
+        bk, bm, wk, wm = material
+        self.material = material
+        self._radix = (
+            BINOMIAL[MAN_SQUARES][wm],
+            BINOMIAL[32 - bm - wm][bk],
+            BINOMIAL[32 - bm - wm - bk][wk],
+        )
+        self.size = BINOMIAL[MAN_SQUARES][bm] * self._radix[0] * self._radix[1] * self._radix[2] * 2
+        self.values = values if values is not None else array("h", bytes(2 * self.size))
+
+    def index(self, black, white, kings, to_move):
+        """Slot of the position given as game.bitboard masks."""
+        black_kings, white_kings = black & kings, white & kings
+        men = (black | white) ^ kings
+        idx = _rank(black ^ black_kings) * self._radix[0] + _rank(white ^ white_kings, 0, WHITE_MAN_OFFSET)
+        idx = idx * self._radix[1] + _rank(black_kings, men)
+        idx = idx * self._radix[2] + _rank(white_kings, men | black_kings)
+        return idx * 2 + (to_move == WHITE)
+
+    def position(self, idx):
+        """(black, white, kings, to_move) of the position in slot idx, or None
+        if the slot has men of both colors on one square."""
+        bk, bm, wk, wm = self.material
+        to_move = WHITE if idx & 1 else BLACK
+        idx, white_kings = divmod(idx >> 1, self._radix[2])
+        idx, black_kings = divmod(idx, self._radix[1])
+        black_men, white_men = divmod(idx, self._radix[0])
+        black_men = _combinations(MAN_SQUARES, bm)[black_men]
+        white_men = _combinations(MAN_SQUARES, wm)[white_men] << WHITE_MAN_OFFSET
+        if black_men & white_men:
+            return None
+        men = black_men | white_men
+        black_kings = _spread(_combinations(32 - bm - wm, bk)[black_kings], men)
+        white_kings = _spread(_combinations(32 - bm - wm - bk, wk)[white_kings], men | black_kings)
+        return black_men | black_kings, white_men | white_kings, black_kings | white_kings, to_move
+
+
+def solve(material, solved):
+    """Build the EndgameTable of material. solved maps material to the tables
+    already built, which must include every one its captures and crownings reach."""
+    table = EndgameTable(material)
+    size = table.size
+    game = Checkers(bitboard=True)
+    board = game.curr_state
+    open_moves = array("i", bytes(4 * size))  # moves within the table to positions not yet settled
+    longest = array("h", bytes(2 * size))  # plies to the longest loss among the moves settled
+    unlost = array("b", bytes(size))  # a move leaving the table draws or wins
+    edges = array("i")  # (from, to) pairs of the moves within the table
+    queue = [[]]  # queue[plies]: (slot, won) to settle at that distance
+
+    def settle(idx, plies, won):
+        while len(queue) <= plies:
+            queue.append([])
+        queue[plies].append((idx, won))
+
+    for idx in range(size):
+        position = table.position(idx)
+        if position is None:
+            continue
+        black, white, kings, to_move = position
+        board.set_bitmasks(black, white, kings, to_move)
+        moves = game.legal_moves(board)
+        if not moves:
+            settle(idx, 0, False)
+            continue
+        shortest_win = None
+        for move in moves:
+            board.push_move(move)
+            after = board.bitmasks()
+            after_material = material_of(*after)
+            if after_material == material:
+                edges.append(idx)
+                edges.append(table.index(*after, board.to_move))
+                open_moves[idx] += 1
+            elif not after[0] or not after[1]:
+                shortest_win = 1
+            else:
+                after_table = solved[after_material]
+                value = after_table.values[after_table.index(*after, board.to_move)]
+                if value < 0:
+                    plies = value_plies(value) + 1
+                    shortest_win = plies if shortest_win is None else min(shortest_win, plies)
+                elif value > 0:
+                    longest[idx] = max(longest[idx], value + 1)
+                else:
+                    unlost[idx] = 1
+            board.pop_move()
+        if shortest_win is not None:
+            unlost[idx] = 1
+            settle(idx, shortest_win, True)
+        elif not open_moves[idx] and not unlost[idx]:
+            settle(idx, longest[idx], False)
+
+    # the moves into each slot, as slices of predecessors
+    starts = array("i", bytes(4 * (size + 1)))
+    for i in range(1, len(edges), 2):
+        starts[edges[i] + 1] += 1
+    for idx in range(size):
+        starts[idx + 1] += starts[idx]
+    ends = array("i", starts)
+    predecessors = array("i", bytes(2 * len(edges)))
+    for i in range(0, len(edges), 2):
+        to = edges[i + 1]
+        predecessors[ends[to]] = edges[i]
+        ends[to] += 1
+    del edges, ends
+
+    values = table.values
+    settled = array("b", bytes(size))
+    plies = 0
+    while plies < len(queue):
+        for idx, won in queue[plies]:
+            if settled[idx]:
+                continue
+            settled[idx] = 1
+            values[idx] = win_value(plies) if won else loss_value(plies)
+            for before in predecessors[starts[idx] : starts[idx + 1]]:
+                if settled[before]:
+                    continue
+                if not won:
+                    settle(before, plies + 1, True)
+                    continue
+                open_moves[before] -= 1
+                longest[before] = max(longest[before], plies + 1)
+                if not open_moves[before] and not unlost[before]:
+                    settle(before, longest[before], False)
+        queue[plies] = None
+        plies += 1
+    return table
+
+
+def mirror(table):
+    """The table of table's material with the colors swapped. Turning the
+    board round and swapping the colors gives a position of the same value."""
+    bk, bm, wk, wm = table.material
+    mirrored = EndgameTable((wk, wm, bk, bm))
+    values = mirrored.values
+    for idx in range(mirrored.size):
+        position = mirrored.position(idx)
+        if position is not None:
+            black, white, kings, to_move = position
+            values[idx] = table.values[table.index(_flip(white), _flip(black), _flip(kings), to_move ^ COLORS)]
+    return mirrored
+
+
+class EndgameDatabase:
+    """A set of EndgameTables, probed by position."""
+
+    def __init__(self, tables=()):
+        self.tables = {table.material: table for table in tables}
+        self.max_pieces = max((sum(material) for material in self.tables), default=0)
+
+    @classmethod
+    def build(cls, max_pieces=ENDGAME_PIECES, report=None):
+        """Solve every table of up to max_pieces pieces, calling report(table, seconds)
+        after each. Of two tables that differ only by the colors, one is mirrored from the other."""
+        tables = {}
+        for material in materials(max_pieces):
+            start = time.perf_counter()
+            bk, bm, wk, wm = material
+            mirrored = tables.get((wk, wm, bk, bm))
+            tables[material] = mirror(mirrored) if mirrored is not None else solve(material, tables)
+            if report is not None:
+                report(tables[material], time.perf_counter() - start)
+        return cls(tables.values())
+
+    @classmethod
+    def load(cls, directory=ENDGAME_DIR):
+        """Read the tables save wrote to directory."""
+        tables = []
+        for name in sorted(os.listdir(directory)):
+            stem, ext = os.path.splitext(name)
+            if ext != ".edb":
+                continue
+            values = array("h")
+            with open(os.path.join(directory, name), "rb") as f:
+                values.frombytes(f.read())
+            if sys.byteorder == "big":
+                values.byteswap()
+            table = EndgameTable(tuple(int(n) for n in stem), values)
+            if len(values) != table.size:
+                raise ValueError(f"{name} has {len(values)} values, not {table.size}")
+            tables.append(table)
+        return cls(tables)
+
+    def save(self, directory=ENDGAME_DIR):
+        """Write each table to directory, named by its material (e.g. 2010.edb
+        for two black kings against a white king) as little-endian 16-bit values."""
+        os.makedirs(directory, exist_ok=True)
+        for material, table in self.tables.items():
+            values = array("h", table.values)
+            if sys.byteorder == "big":
+                values.byteswap()
+            with open(os.path.join(directory, "".join(str(n) for n in material) + ".edb"), "wb") as f:
+                f.write(values.tobytes())
+
+    def probe(self, state):
+        """The table value of state (a Checkerboard or Bitboard), or None if no table has it."""
+        black, white, kings = state.bitmasks()
+        table = self.tables.get(material_of(black, white, kings))
+        if table is None:
+            return None
+        return table.values[table.index(black, white, kings, state.to_move)]
+
+    def score(self, state, ply):
+        """probe as an Engine score for the side to move ply plies from the root, or None."""
+        value = self.probe(state)
+        if value is None:
+            return None
+        if value > 0:
+            return WIN_SCORE - ply - value
+        if value < 0:
+            return -WIN_SCORE + ply + value_plies(value)
+        return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ai.endgame", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--pieces", type=int, default=ENDGAME_PIECES, help=f"most pieces on the board (default {ENDGAME_PIECES})"
+    )
+    parser.add_argument("--out", default=ENDGAME_DIR, help=f"directory to write the tables to (default {ENDGAME_DIR})")
+    args = parser.parse_args(argv)
+
+    def report(table, seconds):
+        values = table.values
+        wins = sum(value > 0 for value in values)
+        losses = sum(value < 0 for value in values)
+        longest = max(map(value_plies, values))
+        print(
+            f"{''.join(str(n) for n in table.material)}: {table.size} slots, {wins} wins, {losses} losses, "
+            f"longest {longest} plies. Time: {seconds:.1f} sec"
+        )
+
+    EndgameDatabase.build(args.pieces, report).save(args.out)
+
+
+if __name__ == "__main__":
+    main()
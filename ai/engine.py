@@ -0,0 +1,261 @@
+"""Checkers-specific search engine.
+
+Unlike the general-purpose searches in ai/games.py, the Engine works directly
+on a Checkerboard (or Bitboard): it makes and takes back moves with
+push_move/pop_move, scores positions from the side to move's point of view
+(negamax) and keeps a TranspositionTable keyed by the board's hash_key. The
+search is a principal variation search: the first move at each node gets the
+full window and the rest are scouted with a null window, then searched again
+only if they turn out better. Each depth is started with an aspiration window
+around the score of the depth before. Moves are searched in the order a
+MoveOrderer (ai/ordering.py) gives them. At the horizon, pending captures are
+played out by a quiescence search so that positions are only ever scored
+once they are quiet. Engine.iterate is the iterative-deepening driver that
+runs search at increasing depths, each starting along the previous one's
+principal variation, for as long as its TimeControl (ai/timecontrol.py)
+allows. With an EndgameDatabase (ai/endgame.py), positions it covers below
+the root are scored from it, exactly, rather than searched."""
+
+from typing import NamedTuple
+
+from ai.ordering import MoveOrderer
+from ai.timecontrol import SearchAborted, TimeControl
+from ai.transposition import TranspositionTable
+from ai.utils import infinity
+from base.move import Move
+from util.globalconst import (
+    ASPIRATION_WINDOW,
+    FUTILITY,
+    FUTILITY_MARGINS,
+    INFINITY,
+    LMR,
+    LMR_MIN_DEPTH,
+    LMR_MIN_MOVES,
+    LMR_REDUCTION,
+    MAX_PLY,
+    WIN_SCORE,
+    hashfALPHA,
+    hashfBETA,
+    hashfEXACT,
+)
+
+WIN_BOUND = WIN_SCORE - MAX_PLY  # scores beyond this are forced wins or losses
+
+
+class SearchResult(NamedTuple):
+    move: Move | None
+    score: float  # from the point of view of the side to move at the root
+    depth: int
+    pv: list  # principal variation, starting with move
+    nodes: int
+
+
+def score_to_tt(score, ply):
+    """Win/loss scores count plies from the root; the table stores them counted from the node."""
+    if score > WIN_BOUND:
+        return score + ply
+    if score < -WIN_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    if score > WIN_BOUND:
+        return score - ply
+    if score < -WIN_BOUND:
+        return score + ply
+    return score
+
+
+class Engine:
+    def __init__(self, game, tt=None, orderer=None, lmr=LMR, futility=FUTILITY, endgames=None):
+        self.game = game
+        self.endgames = endgames
+        self.lmr = lmr  # late move reductions
+        self.futility = futility  # futility pruning
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.orderer = orderer if orderer is not None else MoveOrderer()
+        self.nodes = 0
+        self._pv = [[] for _ in range(MAX_PLY + 1)]
+        self._prev_pv = []
+        self._follow_pv = False
+        self._control = None  # polled every control.poll_nodes nodes while set
+        self._node_base = 0  # nodes searched by earlier depths, for node limits
+        self._next_poll = infinity
+
+    def new_game(self):
+        """Drop everything learned from the previous game."""
+        self.tt.clear()
+        self.orderer.reset()
+
+    def iterate(self, state, control=None, first_depth=1):
+        """Search state one depth at a time, starting at first_depth, and return
+        the SearchResult of the deepest search completed. control, a
+        TimeControl (by default limited to MAX_DEPTH only), decides whether
+        each new depth is started and can abort one in progress; the first
+        depth always completes so there is a move to play. Deepening also ends
+        at a forced win or loss, or when there is only one legal move."""
+        control = control or TimeControl()
+        control.start()
+        single_reply = len(self.game.legal_moves(state)) == 1
+        root_ply = state.search_ply
+        result = score = pv = None
+        depth, last_time, total_nodes = first_depth, 0.0, 0
+        while depth < MAX_PLY and (result is None or control.next_depth(depth, last_time)):
+            depth_start = control.elapsed()
+            self._control = control if result is not None else None
+            self._node_base = total_nodes
+            try:
+                result = self.search(state, depth, score, pv)
+            except SearchAborted:
+                while state.search_ply > root_ply:
+                    state.pop_move()
+                break
+            finally:
+                self._control = None
+            score, pv = result.score, result.pv
+            total_nodes += result.nodes
+            if single_reply or abs(score) > WIN_BOUND:
+                break
+            last_time = control.elapsed() - depth_start
+            depth += 1
+        return result
+
+    def search(self, state, depth, prev_score=None, prev_pv=None):
+        """Search state to depth and return a SearchResult. If prev_score is given
+        (normally the score of the previous depth), start with an aspiration
+        window around it and widen whichever side the score falls outside of.
+        If prev_pv is given, its moves are searched first along that line."""
+        self.nodes = 0
+        self._next_poll = self._control.poll_nodes if self._control is not None else infinity
+        self._prev_pv = prev_pv or []
+        if prev_score is None or abs(prev_score) > WIN_BOUND:
+            alpha, beta = -INFINITY, INFINITY
+        else:
+            alpha, beta = prev_score - ASPIRATION_WINDOW, prev_score + ASPIRATION_WINDOW
+        while True:
+            self._follow_pv = True
+            score = self._pvs(state, depth, alpha, beta, 0)
+            if score <= alpha:
+                alpha = -INFINITY
+            elif score >= beta:
+                beta = INFINITY
+            else:
+                break
+        pv = list(self._pv[0])
+        return SearchResult(pv[0] if pv else None, score, depth, pv, self.nodes)
+
+    def _poll(self):
+        self._next_poll += self._control.poll_nodes
+        self._control.check(self._node_base + self.nodes)
+
+    def _pvs(self, state, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes >= self._next_poll:
+            self._poll()
+        pv = self._pv
+        pv[ply] = []
+        moves = self.game.legal_moves(state)
+        if not moves:
+            return -WIN_SCORE + ply
+        endgames = self.endgames
+        if endgames is not None and ply > 0 and state.piece_count <= endgames.max_pieces:
+            score = endgames.score(state, ply)
+            if score is not None:
+                return score
+        if depth <= 0 or ply >= MAX_PLY - 1:
+            return self._quiesce(state, moves, alpha, beta, ply)
+
+        pv_node = beta - alpha > 1
+        key = state.hash_key
+        entry = self.tt.probe(key, moves)
+        hash_move = None
+        if entry is not None:
+            if not pv_node and entry.depth >= depth:
+                score, flag = score_from_tt(entry.score, ply), entry.flag
+                if (
+                    flag == hashfEXACT
+                    or (flag == hashfBETA and score >= beta)
+                    or (flag == hashfALPHA and score <= alpha)
+                ):
+                    return score
+            hash_move = entry.move
+        # while still on the previous iteration's principal variation, its move goes first
+        following = self._follow_pv and ply < len(self._prev_pv) and self._prev_pv[ply] in moves
+        if following:
+            hash_move = self._prev_pv[ply]
+        moves = self.orderer.order(moves, ply, state.to_move, hash_move)
+
+        # selectivity is kept to quiet moves (captures are forced anyway) outside the principal variation
+        quiet = not pv_node and not moves[0].jumps
+        futile = False
+        if self.futility and quiet and depth < len(FUTILITY_MARGINS) and abs(alpha) < WIN_BOUND:
+            futility_score = state.utility(state.to_move) + FUTILITY_MARGINS[depth]
+            futile = futility_score <= alpha
+        reduce = self.lmr and quiet and depth >= LMR_MIN_DEPTH
+
+        alpha_orig = alpha
+        best_score, best_move = -INFINITY, None
+        for i, move in enumerate(moves):
+            if i > 0 and (futile or reduce) and move.crowns:  # a move that makes a king is neither reduced nor pruned
+                reduced = False
+            elif futile and i > 0:
+                # too far below alpha for a quiet move to make up near the leaves
+                best_score = max(best_score, futility_score)
+                continue
+            else:
+                reduced = reduce and i >= LMR_MIN_MOVES
+            self._follow_pv = following and i == 0
+            state.push_move(move)
+            if i == 0:
+                score = -self._pvs(state, depth - 1, -beta, -alpha, ply + 1)
+            else:
+                if reduced:
+                    score = -self._pvs(state, depth - 1 - LMR_REDUCTION, -alpha - 1, -alpha, ply + 1)
+                # a reduced move that beats alpha is searched again to full depth
+                if not reduced or score > alpha:
+                    score = -self._pvs(state, depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self._pvs(state, depth - 1, -beta, -alpha, ply + 1)
+            state.pop_move()
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if pv_node:
+                        pv[ply] = [move] + pv[ply + 1]
+                    if alpha >= beta:
+                        self.orderer.cutoff(move, ply, depth, state.to_move)
+                        break
+
+        if best_score <= alpha_orig:
+            flag = hashfALPHA
+        elif best_score >= beta:
+            flag = hashfBETA
+        else:
+            flag = hashfEXACT
+        self.tt.store(key, depth, flag, score_to_tt(best_score, ply), best_move)
+        return best_score
+
+    def _quiesce(self, state, moves, alpha, beta, ply):
+        """Search only the captures in moves (and the captures they lead to) until
+        the position is quiet. Captures are compulsory, so the side to move can
+        only stand pat, taking the static score, when it has no capture."""
+        if not moves[0].jumps or ply >= MAX_PLY - 1:
+            return state.utility(state.to_move)
+        best_score = -INFINITY
+        for move in self.orderer.order(moves, ply, state.to_move):
+            state.push_move(move)
+            self.nodes += 1
+            if self.nodes >= self._next_poll:
+                self._poll()
+            replies = self.game.legal_moves(state)
+            score = -self._quiesce(state, replies, -beta, -alpha, ply + 1) if replies else WIN_SCORE - ply - 1
+            state.pop_move()
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
@@ -1,8 +1,11 @@
 """Games, or Adversarial Search. (Chapters 6)"""
 
+import multiprocessing
 import random
+from concurrent.futures import ProcessPoolExecutor
 
 from ai.utils import Dict, Struct, abstract, argmax, argmax_random_tie, if_, infinity, num_or_str, update
+from util.globalconst import hashfALPHA, hashfBETA, hashfEXACT
 
 # Minimax Search
 
@@ -67,11 +70,68 @@ def alphabeta_full_search(state, game):
     return action
 
 
-def alphabeta_search(state, game, d=4, cutoff_test=None, eval_fn=None):
+def alphabeta_search(state, game, d=4, cutoff_test=None, eval_fn=None, tt=None, workers=None):
     """Search game to determine best action; use alpha-beta pruning.
-    This version cuts off search and uses an evaluation function."""
+    This version cuts off search and uses an evaluation function.
+    If a TranspositionTable is given as tt, positions are looked up in it
+    (and stored) by game.hash_key, and its best move is searched first.
+    If workers is given, the root moves are instead split among that many
+    processes (see root_split_search)."""
+    if workers:
+        return root_split_search(state, game, d, cutoff_test, eval_fn, workers)
     player = game.to_move(state)
 
+    def tt_value(st, alpha, beta, depth, maximize):
+        if cutoff_test(st, depth):
+            return eval_fn(st)
+        key = game.hash_key(st)
+        draft = d - depth
+        entry = tt.probe(key)
+        moves = game.legal_moves(st)
+        if entry is not None:
+            if entry.depth >= draft:
+                score, flag = entry.score, entry.flag
+                if (
+                    flag == hashfEXACT
+                    or (flag == hashfBETA and score >= beta)
+                    or (flag == hashfALPHA and score <= alpha)
+                ):
+                    return score
+            # the stored move is searched first, provided it is legal here (keys can collide)
+            if entry.move in moves:
+                moves = [entry.move] + [m for m in moves if m != entry.move]
+        alpha_orig, beta_orig = alpha, beta
+        best_move = None
+        successor = game.successors(st, moves)
+        if maximize:
+            v = -infinity
+            for a, s in successor:
+                score = tt_value(s, alpha, beta, depth + 1, False)
+                if score > v:
+                    v, best_move = score, a
+                if v >= beta:
+                    successor.close()
+                    break
+                alpha = max(alpha, v)
+        else:
+            v = infinity
+            for a, s in successor:
+                score = tt_value(s, alpha, beta, depth + 1, True)
+                if score < v:
+                    v, best_move = score, a
+                if v <= alpha:
+                    successor.close()
+                    break
+                beta = min(beta, v)
+        if v <= alpha_orig:
+            flag = hashfALPHA
+        elif v >= beta_orig:
+            flag = hashfBETA
+        else:
+            flag = hashfEXACT
+        tt.store(key, draft, flag, v, best_move)
+        return v
+
     def max_value(st, alpha, beta, depth):
         if cutoff_test(st, depth):
             return eval_fn(st)
@@ -102,10 +162,100 @@ def alphabeta_search(state, game, d=4, cutoff_test=None, eval_fn=None):
     # The default test cuts off at depth d or at a terminal st
     cutoff_test = cutoff_test or (lambda st, depth: depth > d or game.terminal_test(st))
     eval_fn = eval_fn or (lambda st: game.utility(player, st))
+    if tt is not None:
+        action, state = argmax_random_tie(
+            game.successors(state), lambda a_s: tt_value(a_s[1], -infinity, infinity, 0, False)
+        )
+        return action
     action, state = argmax_random_tie(game.successors(state), lambda a_s: min_value(a_s[1], -infinity, infinity, 0))
     return action
 
 
+def root_split_search(state, game, d=4, cutoff_test=None, eval_fn=None, workers=None):
+    """alphabeta_search with each root move searched as a separate task on a
+    ProcessPoolExecutor of workers processes (by default one per CPU).
+    The best score found so far is shared between the processes, and every
+    task uses it as its alpha bound, picking up improvements as it goes.
+    game, state and any cutoff_test or eval_fn given must be picklable."""
+    actions = game.legal_moves(state)
+    if len(actions) < 2:
+        return actions[0] if actions else []
+    bound = multiprocessing.Value("d", -infinity)
+    with ProcessPoolExecutor(workers, initializer=_init_root_split, initargs=(bound,)) as pool:
+        futures = [pool.submit(_root_split_value, state, game, a, d, cutoff_test, eval_fn) for a in actions]
+        results = [(f.result(), a) for f, a in zip(futures, actions, strict=True)]
+    # a move whose search was cut off only has an upper bound, which may tie the best score
+    exact = [(v, a) for (v, is_exact), a in results if is_exact]
+    v, action = argmax_random_tie(iter(exact), lambda v_a: v_a[0])
+    return action
+
+
+_root_split_bound = None
+
+
+def _init_root_split(bound):
+    global _root_split_bound
+    _root_split_bound = bound
+
+
+def _root_split_value(state, game, action, d, cutoff_test, eval_fn):
+    """Value of action from state (the min_value of alphabeta_search), and whether it is exact."""
+    player = game.to_move(state)
+    bound = _root_split_bound
+
+    def max_value(st, alpha, beta, depth):
+        if cutoff_test(st, depth):
+            return eval_fn(st)
+        v = -infinity
+        successor = game.successors(st)
+        for _a, s in successor:
+            v = max(v, min_value(s, alpha, beta, depth + 1))
+            if v >= beta:
+                successor.close()
+                return v
+            alpha = max(alpha, v)
+        return v
+
+    def min_value(st, alpha, beta, depth):
+        if cutoff_test(st, depth):
+            return eval_fn(st)
+        v = infinity
+        successor = game.successors(st)
+        for _a, s in successor:
+            v = min(v, max_value(s, alpha, beta, depth + 1))
+            if v <= alpha:
+                successor.close()
+                return v
+            beta = min(beta, v)
+        return v
+
+    cutoff_test = cutoff_test or (lambda st, depth: depth > d or game.terminal_test(st))
+    eval_fn = eval_fn or (lambda st: game.utility(player, st))
+    # the move stays made while successor is suspended
+    successor = game.successors(state)
+    st = next(s for a, s in successor if a == action)
+    if cutoff_test(st, 0):
+        v, alpha = eval_fn(st), -infinity
+    else:
+        # the root's min_value, re-reading the shared bound after each reply
+        v, alpha, beta = infinity, bound.value, infinity
+        replies = game.successors(st)
+        for _a, s in replies:
+            v = min(v, max_value(s, alpha, beta, 1))
+            if v <= alpha:
+                replies.close()
+                break
+            beta = min(beta, v)
+            alpha = max(alpha, bound.value)
+    successor.close()
+    is_exact = v > alpha
+    if is_exact:
+        with bound.get_lock():
+            if v > bound.value:
+                bound.value = v
+    return v, is_exact
+
+
 # Players for Games
 def query_player(game, state):
     """Make a move by querying standard input."""
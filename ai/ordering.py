@@ -0,0 +1,62 @@
+"""Move ordering for the checkers engine.
+
+Alpha-beta prunes most when the best move is searched first. MoveOrderer puts
+the move the transposition table remembers for the position first, then, since
+captures are forced and so either every move or no move is a capture, sorts
+captures by the number of pieces taken and quiet moves by two killer moves per
+ply followed by their history-heuristic score. Anything with the same order,
+cutoff and reset methods can be given to the Engine instead."""
+
+from util.globalconst import MAX_PLY
+
+KILLER_BONUS = 1 << 30  # ranks both killers above any history score
+
+
+def _jumps(move):
+    return move.jumps
+
+
+class MoveOrderer:
+    def __init__(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        # history[color][origin * 56 + destination]; indexed by BLACK (1) and WHITE (2)
+        self.history = [[0] * (56 * 56) for _ in range(3)]
+
+    def reset(self):
+        """Forget killers and history, e.g. at the start of a new game."""
+        for killers in self.killers:
+            killers[0] = killers[1] = None
+        for table in self.history:
+            table[:] = [0] * len(table)
+
+    def order(self, moves, ply, to_move, hash_move=None):
+        """Return moves sorted into the order they should be searched."""
+        if len(moves) > 1:
+            if moves[0].jumps:
+                moves = sorted(moves, key=_jumps, reverse=True)
+            else:
+                first, second = self.killers[ply]
+                history = self.history[to_move]
+
+                def rank(move):
+                    if move == first:
+                        return KILLER_BONUS + 1
+                    if move == second:
+                        return KILLER_BONUS
+                    return history[move.origin * 56 + move.destination]
+
+                moves = sorted(moves, key=rank, reverse=True)
+            if hash_move is not None and hash_move in moves:
+                moves.remove(hash_move)
+                moves.insert(0, hash_move)
+        return moves
+
+    def cutoff(self, move, ply, depth, to_move):
+        """Record that move caused a beta cutoff at ply with depth remaining."""
+        if move.jumps:
+            return
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[to_move][move.origin * 56 + move.destination] += depth * depth
@@ -0,0 +1,100 @@
+"""Lazy SMP: a parallel search in which every process searches the whole tree.
+
+The calling process runs the engine as usual while helper processes search the
+same position, all sharing one SharedTranspositionTable. The helpers don't
+report anything; they help by filling the table with results the main search
+then finds instead of searching for itself. Half of them start one depth
+ahead so they are usually working a depth further than the main search.
+
+A LazySMP starts its helpers once and keeps them, each with its own Engine,
+for every search it runs. Each search posts its root position to the shared
+table and sets an Event; the helpers search that root until the Event is
+cleared or another root is posted, then wait for the next one."""
+
+import multiprocessing
+import os
+import time
+
+from ai.engine import Engine
+from ai.timecontrol import TimeControl
+from ai.transposition import SharedTranspositionTable
+from game.bitboard import Bitboard
+from game.checkers import Checkers
+
+SHARED_TT_SIZE = 1 << 18  # slots; two 32-byte buckets each
+IDLE_WAIT = 0.01  # seconds a helper that has finished its root sleeps between looks for the next
+
+
+class LazySMP:
+    """Helper processes for the searches of engine, whose table must be a
+    SharedTranspositionTable: workers processes in all, counting the caller
+    (by default one per CPU). close() stops them."""
+
+    def __init__(self, engine, workers=None):
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self._go = multiprocessing.Event()
+        self._helpers = [
+            multiprocessing.Process(target=_helper, args=(engine.tt, i, self._go), daemon=True)
+            for i in range(1, self.workers)
+        ]
+        for helper in self._helpers:
+            helper.start()
+
+    def iterate(self, state, control=None):
+        """Search state as Engine.iterate does, with the helpers searching it too."""
+        self.engine.tt.post_root(*state.bitmasks(), state.to_move)
+        self._go.set()
+        try:
+            return self.engine.iterate(state, control)
+        finally:
+            self._go.clear()
+
+    def close(self):
+        # a root with no pieces on it tells the helpers to quit
+        self.engine.tt.post_root(0, 0, 0, 0)
+        self._go.set()
+        for helper in self._helpers:
+            helper.join()
+        self._go.clear()
+
+
+def lazy_smp_iterate(game, state, control=None, workers=None, tt_size=SHARED_TT_SIZE):
+    """Search state as Engine.iterate does, with workers processes in all (by
+    default one per CPU), and return the main search's SearchResult. The
+    helpers and table last for this one search; a LazySMP keeps them."""
+    tt = SharedTranspositionTable(tt_size)
+    smp = LazySMP(Engine(game, tt), workers)
+    try:
+        return smp.iterate(state, control)
+    finally:
+        smp.close()
+        tt.close()
+
+
+def _helper(tt, index, go):
+    game = Checkers()
+    board = game.curr_state
+    engine = Engine(game, tt)
+    bitboard = Bitboard()
+    searched = None
+    try:
+        while True:
+            go.wait()
+            count, black, white, kings, to_move = tt.root()
+            if not black | white:
+                break
+            if count == searched:
+                # the search of this root ended by itself; wait for the next
+                time.sleep(IDLE_WAIT)
+                continue
+            bitboard.set_bitmasks(black, white, kings, to_move)
+            board.set_position(bitboard.squares, to_move)
+
+            def stop(count=count):
+                return not go.is_set() or tt.root_count() != count
+
+            engine.iterate(board, TimeControl(depth=None, stop=stop), first_depth=1 + index % 2)
+            searched = count
+    finally:
+        tt.close()
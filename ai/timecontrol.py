@@ -0,0 +1,82 @@
+"""Time controls for the checkers engine.
+
+A TimeControl decides how long Engine.iterate keeps deepening (the soft limit,
+checked between depths) and when a search in progress has to stop (the hard
+limit, node limit or stop callback, polled every POLL_NODES nodes from inside
+the search). When it says stop, check raises SearchAborted; the engine takes
+back the moves it had made and returns the deepest search it completed."""
+
+import time
+
+from util.globalconst import MAX_DEPTH
+
+POLL_NODES = 1024  # nodes searched between looks at the clock
+MOVES_TO_GO = 30  # moves the remaining time is spread over in increment mode
+BRANCHING = 2  # a new depth is expected to take at least this many times as long as the last
+
+
+class SearchAborted(Exception):
+    """Raised from inside the search when the time control runs out."""
+
+
+class TimeControl:
+    def __init__(self, soft=None, hard=None, depth=MAX_DEPTH, nodes=None, stop=None, poll_nodes=POLL_NODES):
+        """soft and hard are in seconds, depth and nodes are limits on the search, and
+        stop is a callable that returns true when the search should give up at once.
+        Any of them may be None for no limit (depth defaults to MAX_DEPTH)."""
+        self.soft = soft
+        self.hard = hard
+        self.depth = depth
+        self.nodes = nodes
+        self.stop = stop
+        self.poll_nodes = poll_nodes
+        self._start = time.perf_counter()
+
+    @classmethod
+    def fixed_time(cls, seconds, stop=None):
+        """Use at most seconds per move."""
+        return cls(soft=seconds, hard=seconds, stop=stop)
+
+    @classmethod
+    def fixed_depth(cls, depth, stop=None):
+        return cls(depth=depth, stop=stop)
+
+    @classmethod
+    def fixed_nodes(cls, nodes, stop=None):
+        """Search exactly as far as nodes allows; the same position always gives the same move."""
+        return cls(nodes=nodes, depth=None, stop=stop)
+
+    @classmethod
+    def increment(cls, remaining, increment, moves_to_go=MOVES_TO_GO, stop=None):
+        """Budget a move out of remaining seconds on the clock, with increment seconds added after each move.
+        The hard limit never takes more than half of what is left, increment or not."""
+        soft = remaining / moves_to_go + increment
+        hard = min(soft * 4, remaining / 2)
+        return cls(soft=min(soft, hard), hard=hard, stop=stop)
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def check(self, nodes):
+        """Raise SearchAborted if the search has to stop now, after nodes nodes in all."""
+        if (
+            (self.nodes is not None and nodes >= self.nodes)
+            or (self.hard is not None and self.elapsed() >= self.hard)
+            or (self.stop is not None and self.stop())
+        ):
+            raise SearchAborted
+
+    def next_depth(self, depth, last_time):
+        """Whether to start a search to depth, given that the one before took last_time seconds."""
+        if self.depth is not None and depth > self.depth:
+            return False
+        if self.stop is not None and self.stop():
+            return False
+        elapsed = self.elapsed()
+        if self.soft is not None and elapsed >= self.soft:
+            return False
+        # a depth the hard limit would cut short anyway isn't worth starting
+        return self.hard is None or elapsed + last_time * BRANCHING < self.hard
@@ -0,0 +1,218 @@
+"""Fixed-size transposition table for the alpha-beta search.
+
+Each slot has two buckets: a depth-preferred one that only gives way to an
+entry searched at least as deep, and an always-replace one that takes
+everything else. Scores mean whatever the search that fills the table makes
+them mean: alphabeta_search stores them from its root player's point of view
+(so keep one table per player), the Engine from the side to move's.
+
+SharedTranspositionTable is the same table kept in shared memory, so that the
+processes of a parallel search can all read and write it."""
+
+import os
+import sys
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+from base.move import Move
+
+WORDS = 4  # 64-bit words per shared bucket: check, depth/flag, score, move hash
+MASK64 = (1 << 64) - 1
+# words after the shared buckets: the root count, then the black, white and kings masks and side to move of the root
+ROOT_WORDS = 5
+
+
+class Entry(NamedTuple):
+    key: int
+    depth: int  # remaining depth the score was searched to
+    flag: int  # hashfEXACT, hashfALPHA (upper bound) or hashfBETA (lower bound)
+    score: float
+    move: Move | None
+
+
+def _slots(size):
+    slots = 1
+    while slots < size:
+        slots <<= 1
+    return slots
+
+
+class TranspositionTable:
+    def __init__(self, size=1 << 16):
+        slots = _slots(size)
+        self._mask = slots - 1
+        self._deep = [None] * slots
+        self._recent = [None] * slots
+        self.probes = 0
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._deep)
+
+    def clear(self):
+        slots = len(self._deep)
+        self._deep = [None] * slots
+        self._recent = [None] * slots
+        self.probes = self.hits = 0
+
+    def probe(self, key, moves=None):
+        """Return the stored Entry for key, or None. (moves is only needed by
+        SharedTranspositionTable.)"""
+        self.probes += 1
+        idx = key & self._mask
+        entry = self._deep[idx]
+        if entry is None or entry.key != key:
+            entry = self._recent[idx]
+            if entry is None or entry.key != key:
+                return None
+        self.hits += 1
+        return entry
+
+    def store(self, key, depth, flag, score, move):
+        idx = key & self._mask
+        entry = Entry(key, depth, flag, score, move)
+        deep = self._deep[idx]
+        if deep is None or deep.key == key or depth >= deep.depth:
+            self._deep[idx] = entry
+            # keep the entry it displaced around until something newer lands on this slot
+            if deep is not None and deep.key != key:
+                self._recent[idx] = deep
+        else:
+            self._recent[idx] = entry
+
+
+class SharedTranspositionTable:
+    """A TranspositionTable in multiprocessing.shared_memory.
+
+    Each bucket is four 64-bit words: the key XOR-ed with the other three,
+    depth and flag, the score as a double, and hash(move). Writers take no
+    lock; a bucket torn by two processes writing at once fails the XOR check
+    and reads as empty. Moves are stored by their hash (which, being a hash of
+    ints, is the same in every process) and handed back by finding the move
+    with that hash in the moves passed to probe. The table pickles as the name
+    of its memory block, so it can be passed to other processes, which attach
+    to the same block; only the process that created it unlinks it on close.
+
+    After the buckets the block holds the root position of the search under
+    way, which post_root publishes to the processes helping with it. The root
+    count is odd while a root is being written, and readers retry until they
+    see the same even count before and after reading the position."""
+
+    def __init__(self, size=1 << 16, name=None):
+        slots = _slots(size)
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=(slots * 2 * WORDS + ROOT_WORDS) * 8)
+            self._owner = os.getpid()
+        else:
+            self._shm = _attach(name)
+            self._owner = None
+        self._mask = slots - 1
+        self._root = slots * 2 * WORDS
+        self._words = self._shm.buf.cast("Q")
+        self._floats = self._shm.buf.cast("d")
+        self.probes = 0
+        self.hits = 0
+
+    def __getstate__(self):
+        return self._shm.name, self._mask + 1
+
+    def __setstate__(self, state):
+        name, slots = state
+        self.__init__(slots, name)
+
+    def __len__(self):
+        return self._mask + 1
+
+    def close(self):
+        self._words.release()
+        self._floats.release()
+        self._shm.close()
+        if self._owner == os.getpid():
+            self._shm.unlink()
+
+    def clear(self):
+        self._shm.buf[: self._root * 8] = bytes(self._root * 8)
+        self.probes = self.hits = 0
+
+    def post_root(self, black, white, kings, to_move):
+        """Publish the position a search is starting from, as game.bitboard masks and the side to move."""
+        words = self._words
+        base = self._root
+        words[base] += 1
+        words[base + 1] = black
+        words[base + 2] = white
+        words[base + 3] = kings
+        words[base + 4] = to_move
+        words[base] += 1
+
+    def root(self):
+        """Return (root count, black, white, kings, to_move) of the last root posted."""
+        words = self._words
+        base = self._root
+        while True:
+            count = words[base]
+            root = count >> 1, words[base + 1], words[base + 2], words[base + 3], words[base + 4]
+            if not count & 1 and words[base] == count:
+                return root
+
+    def root_count(self):
+        """The number of roots posted so far."""
+        return self._words[self._root] >> 1
+
+    def _read(self, base, key):
+        words = self._words
+        info = words[base + 1]
+        if not info or words[base] ^ info ^ words[base + 2] ^ words[base + 3] != key:
+            return None
+        return info
+
+    def probe(self, key, moves=None):
+        """Return the stored Entry for key, or None. The entry's move is the one
+        in moves stored for the position (None if moves is not given)."""
+        self.probes += 1
+        base = (key & self._mask) * 2 * WORDS
+        info = self._read(base, key)
+        if info is None:
+            base += WORDS
+            info = self._read(base, key)
+            if info is None:
+                return None
+        self.hits += 1
+        move = None
+        move_hash = self._words[base + 3]
+        if move_hash and moves:
+            for m in moves:
+                if hash(m) & MASK64 == move_hash:
+                    move = m
+                    break
+        return Entry(key, info >> 8, (info >> 1) & 0x7F, self._floats[base + 2], move)
+
+    def _write(self, base, key, info, score, move_hash):
+        words = self._words
+        words[base + 1] = info
+        self._floats[base + 2] = score
+        words[base + 3] = move_hash
+        words[base] = key ^ info ^ words[base + 2] ^ move_hash
+
+    def store(self, key, depth, flag, score, move):
+        base = (key & self._mask) * 2 * WORDS
+        info = depth << 8 | flag << 1 | 1  # the low bit marks the bucket as used
+        move_hash = hash(move) & MASK64 if move is not None else 0
+        words = self._words
+        deep_info = words[base + 1]
+        deep_key = words[base] ^ deep_info ^ words[base + 2] ^ words[base + 3]
+        if not deep_info or deep_key == key or depth >= deep_info >> 8:
+            # keep the entry it displaced around until something newer lands on this slot
+            if deep_info and deep_key != key:
+                for i in range(WORDS):
+                    words[base + WORDS + i] = words[base + i]
+            self._write(base, key, info, score, move_hash)
+        else:
+            self._write(base + WORDS, key, info, score, move_hash)
+
+
+def _attach(name):
+    if sys.version_info >= (3, 13):
+        # the creating process is the one that cleans the block up
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
@@ -0,0 +1,220 @@
+"""A long-lived engine process for the computer players.
+
+Rather than starting a process and copying the whole game into it for every
+move, the GUI keeps one engine process running (see shared_worker) and sends
+it just the position to search: the 56 squares and the side to move. The
+process keeps its Engine, and with it the transposition table, killers and
+history, from one move to the next, and can ponder: search the position it
+expects after the opponent's reply while the opponent is still thinking.
+Replies carry the id of the request they answer, so a reply to a search that
+was given up on can't be taken for the answer to a later one."""
+
+import atexit
+import multiprocessing
+import os
+import time
+
+from ai.endgame import EndgameDatabase
+from ai.engine import Engine
+from ai.smp import LazySMP
+from ai.timecontrol import TimeControl
+from ai.transposition import SharedTranspositionTable
+from game.checkers import Checkers
+from util.globalconst import ENDGAME_DIR, SEARCH_WORKERS
+
+CAPTURE_DELAY = 0.7  # seconds to wait before making a capture, so the player can follow it
+
+
+def longest_of(moves):
+    length = -1
+    selected = None
+    for move in moves:
+        current_length = len(move.squares)
+        if current_length > length:
+            length = current_length
+            selected = move
+    return selected
+
+
+class EngineWorker:
+    def __init__(self, workers=SEARCH_WORKERS):
+        self.workers = workers
+        self._conn, child_conn = multiprocessing.Pipe()
+        self.stop_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=run_worker,
+            args=(child_conn, self.stop_event, workers),
+            # daemonic processes can't start the helpers of a parallel search
+            daemon=workers == 1,
+        )
+        self.process.start()
+        self._request_id = 0
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def search(self, squares, to_move, search_time, ponder=False):
+        """Start a search of the position and return the id its reply will carry.
+        With ponder, the engine goes on to search the reply it expects while the
+        opponent thinks, and if the next search is of that reply it carries on
+        from there instead of starting over."""
+        self.stop_event.clear()
+        self._request_id += 1
+        self._conn.send(("search", self._request_id, list(squares), to_move, search_time, ponder))
+        return self._request_id
+
+    def result(self, request_id):
+        """Return (True, move) once the reply to request_id has arrived, else (False, None).
+        The move is None if the search was stopped."""
+        while self._conn.poll():
+            reply_id, move = self._conn.recv()
+            if reply_id == request_id:
+                return True, move
+        return False, None
+
+    def stop(self):
+        """Make the search in progress, if any, give up at once."""
+        self.stop_event.set()
+
+    def new_game(self):
+        """Have the engine forget what it learned in the previous game."""
+        self._conn.send(("new_game",))
+
+    def close(self):
+        self.stop()
+        if self.process.is_alive():
+            self._conn.send(("quit",))
+            self.process.join(1)
+
+
+def run_worker(conn, stop_event, workers):
+    # no EvalCache: with the terms kept incrementally, utility costs about what a cache probe does
+    game = Checkers()
+    board = game.curr_state
+    tt = SharedTranspositionTable() if workers > 1 else None
+    # the databases are optional: python -m ai.endgame builds them
+    endgames = EndgameDatabase.load() if os.path.isdir(ENDGAME_DIR) else None
+    engine = Engine(game, tt, endgames=endgames)
+    # the helpers of a parallel search are started once, and search each position the engine does
+    smp = LazySMP(engine, workers) if workers > 1 else None
+    pending = None
+    try:
+        while True:
+            request, pending = pending or conn.recv(), None
+            kind = request[0]
+            if kind == "quit":
+                break
+            if kind == "new_game":
+                engine.new_game()
+            elif kind == "search":
+                _, request_id, squares, to_move, search_time, ponder = request
+                board.set_position(squares, to_move)
+                move, pv = _choose_move(engine, board, search_time, stop_event, smp)
+                conn.send((request_id, move))
+                # think on the opponent's time about the reply the search expects, for as long as it keeps coming
+                while ponder and len(pv) > 1 and not stop_event.is_set():
+                    hit, pending = _ponder(engine, board, pv[:2], conn, stop_event, smp)
+                    if hit is None:
+                        break
+                    request_id, move, pv, ponder = hit
+                    conn.send((request_id, move))
+    finally:
+        if smp is not None:
+            smp.close()
+        if tt is not None:
+            tt.close()
+
+
+def _iterate(engine, board, control, smp):
+    return smp.iterate(board, control) if smp is not None else engine.iterate(board, control)
+
+
+def _take_capture(board):
+    """The capture to play if one is forced (the longest, after CAPTURE_DELAY), else None."""
+    captures = board.captures
+    if not captures:
+        return None
+    time.sleep(CAPTURE_DELAY)
+    return longest_of(captures)
+
+
+def _choose_move(engine, board, search_time, stop_event, smp=None):
+    """Return the move to play and the principal variation it starts (empty for a capture)."""
+    capture = _take_capture(board)
+    if capture is not None:
+        move, pv = capture, []
+    else:
+        result = _iterate(engine, board, TimeControl.fixed_time(search_time, stop=stop_event.is_set), smp)
+        move, pv = result.move, result.pv
+    return (None, []) if stop_event.is_set() else (move, pv)
+
+
+def _ponder(engine, board, expected, conn, stop_event, smp=None):
+    """Search the position after the expected moves (ours, then the opponent's
+    reply) until a request arrives. If it is a search of that very position,
+    the ponder hit, the search carries on with that request's time limit, and
+    (request id, move, pv, ponder) is returned for it; any other request
+    stops the search and is returned as the pending one. After a hit the board
+    is left at the position searched, ready to ponder the next reply from;
+    a forced capture there is played as _choose_move plays one."""
+    for move in expected:
+        board.push_move(move)
+    position = list(board.squares), board.to_move
+    hit = []
+    pending = []
+
+    def is_hit(request):
+        return request[0] == "search" and (request[2], request[3]) == position
+
+    def stop():
+        if stop_event.is_set():
+            return True
+        if not hit and not pending and conn.poll():
+            request = conn.recv()
+            if not is_hit(request):
+                pending.append(request)
+                return True
+            hit.append(request)
+            control.soft = control.hard = control.elapsed() + request[4]
+        return False
+
+    control = TimeControl(depth=None, stop=stop)
+    result = _iterate(engine, board, control, smp)
+    for _ in expected:
+        board.pop_move()
+    if stop_event.is_set():
+        if hit:
+            board.set_position(*position)
+            return (hit[0][1], None, [], False), None
+        return None, pending[0] if pending else None
+    if not hit and not pending:
+        # the search ran out of things to do before the opponent moved
+        request = conn.recv()
+        if not is_hit(request):
+            return None, request
+        hit.append(request)
+    if pending:
+        return None, pending[0]
+    board.set_position(*position)
+    _, request_id, _squares, _to_move, _search_time, ponder = hit[0]
+    capture = _take_capture(board)
+    if capture is not None:
+        return (request_id, capture, [], ponder), None
+    return (request_id, result.move, result.pv, ponder), None
+
+
+_shared_worker = None
+
+
+def shared_worker(workers=SEARCH_WORKERS):
+    """The engine process the computer players share, started on first use,
+    and started again (the old one closed) if asked for with another number of workers."""
+    global _shared_worker
+    if _shared_worker is not None and _shared_worker.workers != workers:
+        atexit.unregister(_shared_worker.close)
+        _shared_worker.close()
+        _shared_worker = None
+    if _shared_worker is None or not _shared_worker.is_alive():
+        _shared_worker = EngineWorker(workers)
+        atexit.register(_shared_worker.close)
+    return _shared_worker
@@ -1,10 +1,63 @@
+from util.globalconst import KING, MAN
+
+
 class Move:
+    """A move, stored as the (index, old value, new value) triples of the board
+    squares it changes. The squares are an immutable tuple, so moves compare and
+    hash by value; the annotation is free-form text and takes no part in either."""
+
+    __slots__ = ("_squares", "annotation")
+
     def __init__(self, squares, annotation=""):
-        self.affected_squares = squares
+        self._squares = tuple(tuple(sq) for sq in squares)
         self.annotation = annotation
 
+    @classmethod
+    def from_tuples(cls, squares, annotation=""):
+        """Wrap a tuple of (index, old, new) tuples without copying it (used by the move generators)."""
+        move = cls.__new__(cls)
+        move._squares = squares
+        move.annotation = annotation
+        return move
+
+    def _get_squares(self):
+        return self._squares
+
+    squares = property(_get_squares, doc="The (index, old, new) triples as a tuple of tuples")
+
+    def _get_affected_squares(self):
+        return [list(sq) for sq in self._squares]
+
+    affected_squares = property(_get_affected_squares, doc="The [index, old, new] triples as a new list of lists")
+
+    def _get_origin(self):
+        return self._squares[0][0]
+
+    origin = property(_get_origin, doc="Board index the moving piece starts from")
+
+    def _get_destination(self):
+        return self._squares[-1][0]
+
+    destination = property(_get_destination, doc="Board index the moving piece ends on")
+
+    def _get_jumps(self):
+        return (len(self._squares) - 1) // 2
+
+    jumps = property(_get_jumps, doc="Number of pieces captured by the move")
+
+    def _get_crowns(self):
+        return bool(self._squares[0][1] & MAN and self._squares[-1][2] & KING)
+
+    crowns = property(_get_crowns, doc="Whether the move makes a king")
+
     def __eq__(self, other):
-        return self.affected_squares == other.affected_squares
+        try:
+            return self._squares == other._squares
+        except AttributeError:
+            return NotImplemented
+
+    def __hash__(self):
+        return hash(self._squares)
 
     def __repr__(self):
         return str(self.affected_squares)
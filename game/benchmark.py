@@ -0,0 +1,142 @@
+"""Micro-benchmarks of the board code, run as python -m game.benchmark.
+
+eval times the evaluation of the same set of positions, taken from seeded
+random games, three ways side by side: from scratch in one pass over the
+board (scan_utility), from the incrementally kept terms (utility), and on a
+Bitboard. The three agree on every score, which is checked as it goes.
+
+movegen measures move generation alone, in moves per second, on the same
+kind of positions: building the legal moves on either board, and counting
+them (legal_move_count, which is what bulk-counting perft does at its last
+ply) without building the quiet ones.
+
+perft times a plain perft from the start, every node's moves built and made
+and unmade with no table and no bulk counting, on either board, which is the
+cost per node of a search less its evaluation. The Bitboard plays its own
+mask-encoded moves with a few XORs, so it should come out well ahead."""
+
+import argparse
+import random
+import time
+
+from game.bitboard import Bitboard
+from game.checkers import Checkerboard, Checkers
+from util.globalconst import BLACK, WHITE
+
+
+def sample_positions(count, seed=1):
+    """(squares, to_move) of count positions from random games played out from the start."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = Checkers()
+        board = game.curr_state
+        while len(positions) < count:
+            moves = game.legal_moves(board)
+            if not moves:
+                break
+            positions.append((list(board.squares), board.to_move))
+            board.make_move(rng.choice(moves), notify=False, undo=False)
+    return positions
+
+
+def _time_per_call(evaluate, boards, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for board in boards:
+            evaluate(board, BLACK)
+            evaluate(board, WHITE)
+    return (time.perf_counter() - start) / (repeat * len(boards) * 2)
+
+
+def bench_eval(count=1000, repeat=20, seed=1):
+    """Return {method: seconds per evaluation} for the three ways of scoring a position."""
+    boards = []
+    bitboards = []
+    for squares, to_move in sample_positions(count, seed):
+        board = Checkers().curr_state
+        board.set_position(squares, to_move)
+        boards.append(board)
+        bitboards.append(Bitboard.from_squares(squares, to_move))
+        for player in (BLACK, WHITE):
+            score = board.scan_utility(player)
+            if board.utility(player) != score or bitboards[-1].utility(player) != score:
+                raise AssertionError(f"evaluations disagree on\n{board}")
+    return {
+        "scan": _time_per_call(Checkerboard.scan_utility, boards, repeat),
+        "incremental": _time_per_call(Checkerboard.utility, boards, repeat),
+        "bitboard": _time_per_call(Bitboard.utility, bitboards, repeat),
+    }
+
+
+def bench_movegen(count=1000, repeat=20, seed=1):
+    """Return {method: legal moves generated per second} on count sampled positions."""
+    positions = sample_positions(count, seed)
+    game = Checkers()
+    bit_game = Checkers(bitboard=True)
+    boards = []
+    bitboards = []
+    total = 0
+    for squares, to_move in positions:
+        board = Checkerboard()
+        board.set_position(squares, to_move)
+        boards.append(board)
+        bitboards.append(Bitboard.from_squares(squares, to_move))
+        total += game.legal_move_count(board)
+    methods = {
+        "checkerboard": (game.legal_moves, boards),
+        "bitboard": (bit_game.legal_moves, bitboards),
+        "checkerboard count": (game.legal_move_count, boards),
+        "bitboard count": (bit_game.legal_move_count, bitboards),
+    }
+    rates = {}
+    for method, (generate, states) in methods.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for state in states:
+                generate(state)
+        rates[method] = total * repeat / (time.perf_counter() - start)
+    return rates
+
+
+def bench_perft(depth=7):
+    """Return {board: (positions counted, seconds)} for a plain perft from the start on either board."""
+    results = {}
+    for name, bitboard in (("checkerboard", False), ("bitboard", True)):
+        game = Checkers(bitboard=bitboard)
+        start = time.perf_counter()
+        count = game.perft(depth)
+        results[name] = (count, time.perf_counter() - start)
+    if results["checkerboard"][0] != results["bitboard"][0]:
+        raise AssertionError(f"perft({depth}) counts disagree: {results}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game.benchmark", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    evaluation = commands.add_parser("eval", help="time the evaluation function three ways")
+    movegen = commands.add_parser("movegen", help="time move generation alone")
+    perft = commands.add_parser("perft", help="time a plain perft on either board")
+    perft.add_argument("--depth", type=int, default=7, help="plies to count to (default 7)")
+    for command in (evaluation, movegen):
+        command.add_argument("--positions", type=int, default=1000, help="number of positions (default 1000)")
+        command.add_argument("--repeat", type=int, default=20, help="passes over the positions (default 20)")
+        command.add_argument("--seed", type=int, default=1, help="seed of the random games (default 1)")
+    args = parser.parse_args(argv)
+
+    if args.command == "eval":
+        for method, seconds in bench_eval(args.positions, args.repeat, args.seed).items():
+            print(f"{method:<12} {seconds * 1e6:8.2f} us/eval")
+    elif args.command == "movegen":
+        for method, rate in bench_movegen(args.positions, args.repeat, args.seed).items():
+            print(f"{method:<20} {rate:12,.0f} moves/sec")
+    elif args.command == "perft":
+        results = bench_perft(args.depth)
+        for name, (count, seconds) in results.items():
+            print(f"{name:<12} {count:10,} positions {seconds:8.2f} sec {count / seconds:12,.0f} positions/sec")
+        print(f"bitboard speedup {results['checkerboard'][1] / results['bitboard'][1]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
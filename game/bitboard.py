@@ -0,0 +1,724 @@
+from base.move import Move
+from game.zobrist import SIDE_KEY, SQUARE_KEYS
+from util.globalconst import (
+    BLACK,
+    BLACK_CHAR,
+    BLACK_IDX,
+    BLACK_KING,
+    COLORS,
+    CRAMP,
+    ENDGAME,
+    FREE,
+    FREE_CHAR,
+    INTACT_DOUBLE_CORNER,
+    KCV,
+    KEV,
+    KING,
+    KING_IDX,
+    MAN,
+    MAX_PLY,
+    MCV,
+    MEV,
+    MIDGAME,
+    OPENING,
+    TURN,
+    WHITE,
+    WHITE_CHAR,
+    WHITE_IDX,
+    WHITE_KING,
+)
+
+#   (white)
+#            28  29  30  31
+#          24  25  26  27
+#            20  21  22  23
+#          16  17  18  19
+#            12  13  14  15
+#          8   9   10  11
+#            4   5   6   7
+#          0   1   2   3
+#   (black)
+#
+# Bit numbers for the playable squares. Bit i stands for SQUARES[i], the
+# matching index in Checkerboard's 56-entry padded layout, which is how a
+# BitMove gives its affected_squares in the form the rest of the program uses.
+SQUARES = (6, 7, 8, 9, 12, 13, 14, 15, 17, 18, 19, 20, 23, 24, 25, 26,
+           28, 29, 30, 31, 34, 35, 36, 37, 39, 40, 41, 42, 45, 46, 47, 48)  # fmt: skip
+BIT_INDEX = {sq: i for i, sq in enumerate(SQUARES)}
+BITS = {sq: 1 << i for i, sq in enumerate(SQUARES)}
+BIT_ITEMS = tuple(BITS.items())
+FULL_MASK = (1 << 32) - 1
+BIT_KEYS = tuple(SQUARE_KEYS[sq] for sq in SQUARES)  # Zobrist keys by bit number
+
+
+def _neighbor_table(step):
+    """Bit index reached by one diagonal step (a padded-layout offset), or -1 when off the board."""
+    return tuple(BIT_INDEX.get(sq + step, -1) for sq in SQUARES)
+
+
+NEIGHBORS = {step: _neighbor_table(step) for step in KING_IDX}
+
+
+def _shift_table(step):
+    """Group the squares that have a neighbor in this direction by how far the bit moves."""
+    groups = {}
+    for i, j in enumerate(NEIGHBORS[step]):
+        if j >= 0:
+            groups[j - i] = groups.get(j - i, 0) | 1 << i
+    return tuple(groups.items())
+
+
+SHIFTS = {step: _shift_table(step) for step in KING_IDX}
+
+
+def shift(bb, step):
+    """Move every bit of bb one diagonal step; bits that would leave the board are dropped."""
+    result = 0
+    for delta, mask in SHIFTS[step]:
+        if delta > 0:
+            result |= (bb & mask) << delta
+        else:
+            result |= (bb & mask) >> -delta
+    return result
+
+
+# shift(bb, -step) for each step, written out for the move generators: the
+# squares from which a step that way lands in bb.
+def _from_minus_6(bb):
+    return (bb & 0xF0F0F0F) << 4 | (bb & 0x707070) << 5
+
+
+def _from_minus_5(bb):
+    return (bb & 0xE0E0E0E) << 3 | (bb & 0xF0F0F0) << 4
+
+
+def _from_plus_5(bb):
+    return (bb & 0x70707070) >> 3 | (bb & 0xF0F0F00) >> 4
+
+
+def _from_plus_6(bb):
+    return (bb & 0xF0F0F0F0) >> 4 | (bb & 0xE0E0E00) >> 5
+
+
+def _mask_of(squares):
+    mask = 0
+    for sq in squares:
+        mask |= BITS[sq]
+    return mask
+
+
+BLACK_CROWN_ROW = _mask_of((45, 46, 47, 48))
+WHITE_CROWN_ROW = _mask_of((6, 7, 8, 9))
+CENTER_MASK = _mask_of((18, 19, 24, 25, 29, 30, 35, 36))
+EDGE_MASK = _mask_of((6, 7, 8, 9, 15, 17, 26, 28, 37, 39, 45, 46, 47, 48))
+SAFE_EDGE_MASK = _mask_of((9, 15, 39, 45))
+ROW_MASKS = tuple(0xF << (4 * r) for r in range(8))
+# ROW_BIT_MASKS[k]: the rows whose number has bit k set, so that the sum of the
+# row numbers of a mask's squares is the sum of 2**k * popcount(mask & ROW_BIT_MASKS[k])
+ROW_BIT_MASKS = tuple(sum(row for r, row in enumerate(ROW_MASKS) if r >> k & 1) for k in range(3))
+BLACK_SYSTEM_MASK = _mask_of(i + 11 * j for i in range(6, 10) for j in range(4))
+WHITE_SYSTEM_MASK = _mask_of(i + 11 * j for i in range(12, 16) for j in range(4))
+
+
+# (position in KING_IDX, step) pairs in the order Checkerboard generates moves
+KING_SLOTS = tuple(enumerate(KING_IDX))
+MAN_SLOTS = {color: tuple((KING_IDX.index(step), step) for step in steps)
+             for color, steps in ((BLACK, BLACK_IDX), (WHITE, WHITE_IDX))}  # fmt: skip
+
+
+def quiet_movers(player, own, kings, empty):
+    """Return, per direction, the mask of own pieces that can make a quiet step that way.
+
+    Each mask costs one whole-board shift of the empty squares, so the work does
+    not depend on how many squares or pieces are on the board."""
+    own_kings = own & kings
+    if player == BLACK:
+        return [
+            own_kings & _from_minus_6(empty),
+            own_kings & _from_minus_5(empty),
+            own & _from_plus_5(empty),
+            own & _from_plus_6(empty),
+        ]
+    return [
+        own & _from_minus_6(empty),
+        own & _from_minus_5(empty),
+        own_kings & _from_plus_5(empty),
+        own_kings & _from_plus_6(empty),
+    ]
+
+
+def quiet_move_count(player, own, kings, empty):
+    """Number of quiet moves available, without building any Move objects."""
+    return sum(movers.bit_count() for movers in quiet_movers(player, own, kings, empty))
+
+
+def quiet_moves(player, own, kings, empty):
+    """Yield quiet moves in Checkerboard order (by source square, then direction),
+    materializing each Move only when the caller asks for it."""
+    movers = quiet_movers(player, own, kings, empty)
+    crown_row = BLACK_CROWN_ROW if player == BLACK else WHITE_CROWN_ROW
+    sources = movers[0] | movers[1] | movers[2] | movers[3]
+    for i in iter_bits(sources):
+        src = SQUARES[i]
+        if kings >> i & 1:
+            slots, piece = KING_SLOTS, player | KING
+        else:
+            slots, piece = MAN_SLOTS[player], player | MAN
+        for slot, step in slots:
+            if movers[slot] >> i & 1:
+                j = NEIGHBORS[step][i]
+                new_piece = player | KING if crown_row >> j & 1 else piece
+                yield Move.from_tuples(((src, piece, FREE), (SQUARES[j], FREE, new_piece)))
+
+
+def quiet_bit_moves(player, own, kings, empty):
+    """The list of quiet moves as BitMoves, for the Bitboard, in the same order as quiet_moves.
+    A quiet move depends only on the piece and the two squares, so each one is
+    made once, in QUIET_BIT_MOVES, and handed out every time."""
+    minus_6, minus_5, plus_5, plus_6 = quiet_movers(player, own, kings, empty)
+    king_minus_6, king_minus_5, king_plus_5, king_plus_6 = QUIET_BIT_MOVES[player | KING]
+    moves = []
+    append = moves.append
+    sources = minus_6 | minus_5 | plus_5 | plus_6
+    if player == BLACK:
+        _, _, man_first, man_second = QUIET_BIT_MOVES[BLACK | MAN]
+        first, second = plus_5, plus_6
+    else:
+        man_second, man_first, _, _ = QUIET_BIT_MOVES[WHITE | MAN]
+        first, second = minus_5, minus_6  # WHITE_IDX order
+    while sources:
+        bit = sources & -sources
+        sources ^= bit
+        i = bit.bit_length() - 1
+        if kings & bit:
+            if minus_6 & bit:
+                append(king_minus_6[i])
+            if minus_5 & bit:
+                append(king_minus_5[i])
+            if plus_5 & bit:
+                append(king_plus_5[i])
+            if plus_6 & bit:
+                append(king_plus_6[i])
+        else:
+            if first & bit:
+                append(man_first[i])
+            if second & bit:
+                append(man_second[i])
+    return moves
+
+
+def iter_bits(bb):
+    """Yield the set bit indices of bb in ascending order."""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+class BitMove:
+    """A Bitboard move, kept as masks so that making it or taking it back is a
+    few XORs. moved has the mover's start and end squares, captured the pieces
+    it takes and kings the squares whose king bit changes: those of a moving
+    king, the square a man crowns on and the kings taken. path has the bit
+    numbers of the start square, each piece jumped and each square landed on.
+    The (index, old, new) squares of a Move are only worked out when asked
+    for, by the GUI or PDN code for instance, and then kept."""
+
+    __slots__ = ("piece", "path", "moved", "captured", "kings", "_key_delta", "_squares", "annotation")
+
+    def __init__(self, piece, path, moved, captured, kings):
+        self.piece = piece
+        self.path = path
+        self.moved = moved
+        self.captured = captured
+        self.kings = kings
+        self._key_delta = None
+        self._squares = None
+        self.annotation = ""
+
+    @classmethod
+    def from_move(cls, move):
+        """The BitMove of a Move."""
+        squares = move.squares
+        piece = squares[0][1]
+        enemy = piece & COLORS ^ COLORS
+        moved = captured = kings = 0
+        for idx, old, new in squares:
+            bit = BITS[idx]
+            if (old | new) & piece & COLORS:
+                moved ^= bit
+            if old & enemy:
+                captured |= bit
+            if (old ^ new) & KING:
+                kings ^= bit
+        return cls(piece, tuple(BIT_INDEX[idx] for idx, _, _ in squares), moved, captured, kings)
+
+    def _get_new_piece(self):
+        piece = self.piece
+        return piece ^ (MAN | KING) if piece & MAN and self.kings >> self.path[-1] & 1 else piece
+
+    def _get_key_delta(self):
+        if self._key_delta is None:
+            path, kings = self.path, self.kings
+            delta = BIT_KEYS[path[0]][self.piece] ^ BIT_KEYS[path[-1]][self._get_new_piece()]
+            enemy = self.piece & COLORS ^ COLORS
+            for mid in path[1:-1:2]:
+                delta ^= BIT_KEYS[mid][enemy | (KING if kings >> mid & 1 else MAN)]
+            self._key_delta = delta
+        return self._key_delta
+
+    key_delta = property(_get_key_delta, doc="What the move XORs into the Zobrist key, either way")
+
+    def _get_squares(self):
+        if self._squares is None:
+            path, kings = self.path, self.kings
+            enemy = self.piece & COLORS ^ COLORS
+            squares = [(SQUARES[path[0]], self.piece, FREE)]
+            for k in range(1, len(path) - 1):
+                bit = path[k]
+                # jumped pieces at odd places in the path, squares landed on at even ones
+                squares.append((SQUARES[bit], enemy | (KING if kings >> bit & 1 else MAN) if k & 1 else FREE, FREE))
+            squares.append((SQUARES[path[-1]], FREE, self._get_new_piece()))
+            self._squares = tuple(squares)
+        return self._squares
+
+    squares = property(_get_squares, doc="The (index, old, new) triples as a tuple of tuples")
+
+    def _get_affected_squares(self):
+        return [list(sq) for sq in self._get_squares()]
+
+    affected_squares = property(_get_affected_squares, doc="The [index, old, new] triples as a new list of lists")
+
+    def _get_origin(self):
+        return SQUARES[self.path[0]]
+
+    origin = property(_get_origin, doc="Board index the moving piece starts from")
+
+    def _get_destination(self):
+        return SQUARES[self.path[-1]]
+
+    destination = property(_get_destination, doc="Board index the moving piece ends on")
+
+    def _get_jumps(self):
+        return (len(self.path) - 1) // 2
+
+    jumps = property(_get_jumps, doc="Number of pieces captured by the move")
+
+    def _get_crowns(self):
+        return bool(self.piece & MAN and self.kings >> self.path[-1] & 1)
+
+    crowns = property(_get_crowns, doc="Whether the move makes a king")
+
+    def __eq__(self, other):
+        try:
+            return self.path == other.path and self.piece == other.piece
+        except AttributeError:
+            return NotImplemented
+
+    def __hash__(self):
+        return hash((self.piece, self.path))
+
+    def __repr__(self):
+        return str(self.affected_squares)
+
+
+def _quiet_bit_move(piece, i, step):
+    j = NEIGHBORS[step][i]
+    if j < 0:
+        return None
+    moved = 1 << i | 1 << j
+    if piece & KING:
+        return BitMove(piece, (i, j), moved, 0, moved)
+    crown_row = BLACK_CROWN_ROW if piece & BLACK else WHITE_CROWN_ROW
+    return BitMove(piece, (i, j), moved, 0, crown_row & 1 << j)
+
+
+# QUIET_BIT_MOVES[piece][direction][bit]: the quiet move of piece from that
+# bit one step in that direction (of KING_IDX), or None off the board
+QUIET_BIT_MOVES = {
+    piece: tuple(tuple(_quiet_bit_move(piece, i, step) for i in range(32)) for step in KING_IDX)
+    for piece in (BLACK | MAN, BLACK | KING, WHITE | MAN, WHITE | KING)
+}
+
+
+class Bitboard:
+    """Checkerboard alternative that stores the position as three 32-bit masks
+    (black pieces, white pieces and kings) instead of a 56-entry square list.
+    It has Checkerboard's move order and evaluation, and is intended for perft
+    and search rather than for driving the GUI. Its moves are BitMoves;
+    make_move and undo_move also take a Move, push_move and pop_move don't."""
+
+    def __init__(self):
+        self.black = 0xFFF
+        self.white = 0xFFF << 20
+        self.kings = 0
+        self.to_move = BLACK
+        self.observers = []
+        self.undo_list = []
+        self.redo_list = []
+        # moves played by push_move, kept apart from the annotated undo/redo history
+        self._search_stack = [None] * MAX_PLY
+        self._search_ply = 0
+        self._key = None
+
+    @classmethod
+    def from_squares(cls, squares, to_move):
+        """Build a bitboard from a Checkerboard-style 56-entry square list."""
+        board = cls()
+        board.black = board.white = board.kings = 0
+        for sq, bit in BITS.items():
+            piece = squares[sq]
+            if piece & BLACK:
+                board.black |= bit
+            elif piece & WHITE:
+                board.white |= bit
+            if piece & KING:
+                board.kings |= bit
+        board.to_move = to_move
+        return board
+
+    def __repr__(self):
+        sq = self.squares
+        lookup = {BLACK | MAN: BLACK_CHAR, WHITE | MAN: WHITE_CHAR, BLACK | KING: BLACK_KING, WHITE | KING: WHITE_KING}
+        rows = []
+        for r in range(7, -1, -1):
+            chars = [lookup.get(sq[s], FREE_CHAR) for s in SQUARES[4 * r : 4 * r + 4]]
+            indent = "  " if r % 2 else ""
+            rows.append(f"{r + 1} {indent}" + "   ".join(chars))
+        rows.append("  a b c d e f g h")
+        return "\n".join(rows)
+
+    def _get_enemy(self):
+        if self.to_move == BLACK:
+            return WHITE
+        return BLACK
+
+    enemy = property(_get_enemy, doc="The color for the player that doesn't have the current turn")
+
+    def _get_hash_key(self):
+        if self._key is None:
+            key = 0
+            for sq, bit in BIT_ITEMS:
+                key ^= SQUARE_KEYS[sq][self.piece_at(bit)]
+            self._key = key
+        return self._key ^ SIDE_KEY if self.to_move == WHITE else self._key
+
+    hash_key = property(_get_hash_key, doc="64-bit Zobrist key, equal to Checkerboard's")
+
+    def _get_squares(self):
+        squares = [0] * 56
+        for sq, bit in BITS.items():
+            squares[sq] = self.piece_at(bit)
+        return squares
+
+    squares = property(_get_squares, doc="Checkerboard-style square list (a read-only snapshot)")
+
+    def attach(self, observer):
+        if observer not in self.observers:
+            self.observers.append(observer)
+
+    def detach(self, observer):
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def clear(self):
+        self.black = self.white = self.kings = 0
+        self._key = None
+
+    def set_position(self, squares, to_move):
+        """Load a Checkerboard-style square list and the side to move onto the board."""
+        board = self.from_squares(squares, to_move)
+        self.black, self.white, self.kings = board.black, board.white, board.kings
+        self.to_move = to_move
+        self._key = None
+
+    def set_bitmasks(self, black, white, kings, to_move):
+        """Load a position given as (black, white, kings) masks and the side to move."""
+        self.black, self.white, self.kings = black, white, kings
+        self.to_move = to_move
+        self._key = None
+
+    def bitmasks(self):
+        return self.black, self.white, self.kings
+
+    def _get_piece_count(self):
+        return (self.black | self.white).bit_count()
+
+    piece_count = property(_get_piece_count, doc="Number of pieces on the board, both colors")
+
+    def piece_at(self, bit):
+        if self.black & bit:
+            return BLACK | (KING if self.kings & bit else MAN)
+        if self.white & bit:
+            return WHITE | (KING if self.kings & bit else MAN)
+        return FREE
+
+    def set_piece(self, sq, piece):
+        bit = BITS[sq]
+        self.black &= ~bit
+        self.white &= ~bit
+        self.kings &= ~bit
+        if piece & BLACK:
+            self.black |= bit
+        elif piece & WHITE:
+            self.white |= bit
+        if piece & KING:
+            self.kings |= bit
+        self._key = None
+
+    def count(self, color):
+        return (self.white if color == WHITE else self.black).bit_count()
+
+    def _apply(self, move):
+        """Make move, or take it back: it is the same XORs either way."""
+        if move.piece & BLACK:
+            self.black ^= move.moved
+            self.white ^= move.captured
+        else:
+            self.white ^= move.moved
+            self.black ^= move.captured
+        self.kings ^= move.kings
+        if self._key is not None:
+            self._key ^= move.key_delta
+        self.to_move ^= COLORS
+
+    def make_move(self, move, notify=True, undo=True, annotation=""):
+        # quiet moves are shared (see quiet_bit_moves), so the history gets a copy to annotate
+        move = BitMove.from_move(move) if undo or move.__class__ is not BitMove else move
+        self._apply(move)
+        if notify:
+            for o in self.observers:
+                o.notify(move)
+        if undo:
+            move.annotation = annotation
+            self.undo_list.append(move)
+        return self
+
+    def push_move(self, move):
+        """Search-only make_move: no observers or undo history, and no allocation."""
+        # _apply, written out
+        if move.piece & BLACK:
+            self.black ^= move.moved
+            self.white ^= move.captured
+        else:
+            self.white ^= move.moved
+            self.black ^= move.captured
+        self.kings ^= move.kings
+        if self._key is not None:
+            self._key ^= move.key_delta
+        self.to_move ^= COLORS
+        self._search_stack[self._search_ply] = move
+        self._search_ply += 1
+
+    def pop_move(self):
+        """Take back the last push_move and return the move."""
+        self._search_ply -= 1
+        move = self._search_stack[self._search_ply]
+        self._apply(move)
+        return move
+
+    def _get_search_ply(self):
+        return self._search_ply
+
+    search_ply = property(_get_search_ply, doc="Number of push_move calls not yet taken back")
+
+    def undo_move(self, move=None, notify=True, redo=True, annotation=""):
+        if move is None:
+            if not self.undo_list:
+                return
+            if redo:
+                move = self.undo_list.pop()
+        move = BitMove.from_move(move) if redo or move.__class__ is not BitMove else move
+        self._apply(move)
+        if notify and self.observers:
+            rev_move = Move.from_tuples(tuple((idx, dest, src) for idx, src, dest in move.squares))
+            for o in self.observers:
+                o.notify(rev_move)
+        if redo:
+            move.annotation = annotation
+            self.redo_list.append(move)
+
+    def iter_moves(self):
+        return iter(self._get_moves())
+
+    def _get_moves(self):
+        own = self.black if self.to_move == BLACK else self.white
+        return quiet_bit_moves(self.to_move, own, self.kings, ~(self.black | self.white) & FULL_MASK)
+
+    moves = property(_get_moves, doc="Available moves for the current player")
+
+    def _get_move_count(self):
+        own = self.black if self.to_move == BLACK else self.white
+        return quiet_move_count(self.to_move, own, self.kings, ~(self.black | self.white) & FULL_MASK)
+
+    move_count = property(_get_move_count, doc="Number of quiet moves for the current player, none of them built")
+
+    def _get_captures(self):
+        player = self.to_move
+        if player == BLACK:
+            own, enemy, man_steps = self.black, self.white, BLACK_IDX
+            crown_row = BLACK_CROWN_ROW
+        else:
+            own, enemy, man_steps = self.white, self.black, WHITE_IDX
+            crown_row = WHITE_CROWN_ROW
+        kings = self.kings
+        empty = ~(self.black | self.white) & FULL_MASK
+        # whole-board test first: pieces with an enemy beside them and an empty square beyond
+        forward = _from_plus_5(enemy & _from_plus_5(empty)) | _from_plus_6(enemy & _from_plus_6(empty))
+        backward = _from_minus_5(enemy & _from_minus_5(empty)) | _from_minus_6(enemy & _from_minus_6(empty))
+        if player == WHITE:
+            forward, backward = backward, forward
+        jumpers = own & (forward | kings & backward)
+        captures = []
+        for i in iter_bits(jumpers):
+            is_king = kings >> i & 1
+            steps = KING_IDX if is_king else man_steps
+            # the jumping piece leaves its square, so it may land there again
+            empty = (~(self.black | self.white) | (1 << i)) & FULL_MASK
+            for step in steps:
+                mid = NEIGHBORS[step][i]
+                if mid < 0 or not enemy >> mid & 1:
+                    continue
+                dest = NEIGHBORS[step][mid]
+                if dest < 0 or not empty >> dest & 1:
+                    continue
+                path = [mid, dest]
+                visited = {i << 5 | dest}
+                self._extend_capture(i, is_king, steps, enemy, empty, crown_row, path, visited, captures)
+        return captures
+
+    captures = property(_get_captures, doc="Forced captures for the current player")
+
+    def _extend_capture(self, start, is_king, steps, enemy, empty, crown_row, path, visited, captures):
+        last = path[-1]
+        found = []
+        for step in steps:
+            mid = NEIGHBORS[step][last]
+            if mid < 0 or not enemy >> mid & 1:
+                continue
+            dest = NEIGHBORS[step][mid]
+            if dest < 0 or not empty >> dest & 1:
+                continue
+            if last << 5 | dest in visited or dest << 5 | last in visited:
+                continue
+            visited.add(last << 5 | dest)
+            found.append((mid, dest))
+        if not found:
+            captures.append(self._capture_move(start, is_king, crown_row, path))
+            return
+        # later directions are explored first, matching Checkerboard's capture order
+        for mid, dest in reversed(found):
+            path.append(mid)
+            path.append(dest)
+            self._extend_capture(start, is_king, steps, enemy, empty, crown_row, path, visited, captures)
+            del path[-2:]
+
+    def _capture_move(self, start, is_king, crown_row, path):
+        end = path[-1]
+        captured = 0
+        for mid in path[::2]:
+            captured |= 1 << mid
+        moved = 1 << start ^ 1 << end
+        kings = captured & self.kings
+        if is_king:
+            return BitMove(self.to_move | KING, (start, *path), moved, captured, kings ^ moved)
+        return BitMove(self.to_move | MAN, (start, *path), moved, captured, kings | crown_row & 1 << end)
+
+    def utility(self, player):
+        """Player evaluation function (scores identically to Checkerboard.utility)"""
+        black, white, kings = self.black, self.white, self.kings
+        bm = black & ~kings
+        bk = black & kings
+        wm = white & ~kings
+        wk = white & kings
+        # same (swapped) naming as Checkerboard.utility so the terms line up
+        nwm = bm.bit_count()
+        nwk = bk.bit_count()
+        nbm = wm.bit_count()
+        nbk = wk.bit_count()
+
+        v1 = 100 * nbm + 130 * nbk
+        v2 = 100 * nwm + 130 * nwk
+
+        evaluation = v1 - v2  # material values
+        # favor exchanges if in material plus
+        evaluation += (250 * (v1 - v2)) / (v1 + v2)
+
+        nm = nbm + nwm
+        nk = nbk + nwk
+
+        if player == BLACK:
+            evaluation += TURN
+            multiplier = -1
+        else:
+            evaluation -= TURN
+            multiplier = 1
+
+        # no back rank guard, for the reason given in Checkerboard._evaluate
+        return multiplier * (
+            evaluation
+            + self._eval_cramp(bm, wm)
+            + self._eval_double_corner(bm, wm)
+            + (((bm & CENTER_MASK).bit_count() - (wm & CENTER_MASK).bit_count()) * MCV
+               + ((bk & CENTER_MASK).bit_count() - (wk & CENTER_MASK).bit_count()) * KCV)
+            + (-((bm & EDGE_MASK).bit_count() - (wm & EDGE_MASK).bit_count()) * MEV
+               - ((bk & EDGE_MASK).bit_count() - (wk & EDGE_MASK).bit_count()) * KEV)
+            + self._eval_tempo(bm, bk, wm, wk, nm, nbk, nbm, nwk, nwm)
+            + self._eval_player_opposition(nwm, nwk, nbk, nbm, nm, nk)
+        )  # fmt: skip
+
+    @staticmethod
+    def _eval_cramp(bm, wm):
+        evaluation = 0
+        if bm & BITS[28] and wm & BITS[34]:
+            evaluation += CRAMP
+        if wm & BITS[26] and bm & BITS[20]:
+            evaluation -= CRAMP
+        return evaluation
+
+    @staticmethod
+    def _eval_double_corner(bm, wm):
+        evaluation = 0
+        if bm & BITS[9] and bm & (BITS[14] | BITS[15]):
+            evaluation += INTACT_DOUBLE_CORNER
+        if wm & BITS[45] and wm & (BITS[39] | BITS[40]):
+            evaluation -= INTACT_DOUBLE_CORNER
+        return evaluation
+
+    @staticmethod
+    def _eval_tempo(bm, bk, wm, wk, nm, nbk, nbm, nwk, nwm):
+        evaluation = 0
+        first, second, third = ROW_BIT_MASKS
+        # the sum of the black men's rows less that of the white men's distances (7 - row) from row 7
+        tempo = (
+            ((bm | wm) & first).bit_count()
+            + 2 * ((bm | wm) & second).bit_count()
+            + 4 * ((bm | wm) & third).bit_count()
+            - 7 * wm.bit_count()
+        )
+
+        if nm >= 16:
+            evaluation += OPENING * tempo
+        if 15 >= nm >= 12:
+            evaluation += MIDGAME * tempo
+        if nm < 9:
+            evaluation += ENDGAME * tempo
+
+        if nbk + nbm > nwk + nwm and nwk < 3:
+            evaluation -= 15 * (wk & SAFE_EDGE_MASK).bit_count()
+        if nwk + nwm > nbk + nbm and nbk < 3:
+            evaluation += 15 * (bk & SAFE_EDGE_MASK).bit_count()
+        return evaluation
+
+    def _eval_player_opposition(self, nwm, nwk, nbk, nbm, nm, nk):
+        evaluation = 0
+        tn = nm + nk
+        if nwm + nwk - nbk - nbm == 0:
+            occupied = self.black | self.white
+            if self.to_move == BLACK:
+                in_system = (occupied & BLACK_SYSTEM_MASK).bit_count() % 2 == 1
+            else:
+                in_system = (occupied & WHITE_SYSTEM_MASK).bit_count() % 2 == 0
+            bonus = (tn <= 12) + (tn <= 10) + 2 * (tn <= 8) + 2 * (tn <= 6)
+            evaluation += bonus if in_system else -bonus
+        return evaluation
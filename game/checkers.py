@@ -2,12 +2,14 @@ import time
 
 import ai.games as games
 from base.move import Move
+from game.bitboard import BITS, FULL_MASK, Bitboard, quiet_move_count, quiet_moves
+from game.evalcache import EvalCache
+from game.zobrist import SIDE_KEY, SQUARE_KEYS, squares_key
 from util.globalconst import (
     BLACK,
     BLACK_CHAR,
     BLACK_IDX,
     BLACK_KING,
-    BRV,
     COLORS,
     CRAMP,
     ENDGAME,
@@ -19,6 +21,7 @@ from util.globalconst import (
     KING,
     KING_IDX,
     MAN,
+    MAX_PLY,
     MCV,
     MEV,
     MIDGAME,
@@ -164,6 +167,22 @@ class Checkerboard:
         self.black_total = 12
         self.grid_map = create_grid_map()
         self.ok_to_move = True
+        # landing/captured squares of the jump chain being searched; every jump
+        # needs a distinct (enemy, diagonal) pair, so 24 jumps is a hard ceiling
+        self._capture_path = [0] * 48
+        # moves played by push_move, kept apart from the annotated undo/redo history
+        self._search_stack = [None] * MAX_PLY
+        self._search_ply = 0
+        # Zobrist key of the squares (side to move is folded in by hash_key);
+        # None until first asked for, and again after clear() while a new position is set up
+        self._key = None
+        # the additive evaluation terms packed as in EVAL_TERMS; kept up alongside _key, and only valid while it is
+        self._terms = 0
+        # the black, white and kings masks packed as in SQUARE_MASKS; kept up like _key, and started with it or
+        # on their own by the move generators, so they are live whenever _key is and sometimes when it isn't
+        self._masks = None
+        # EvalCache in front of utility, if any
+        self.eval_cache = None
 
     def __repr__(self):
         bc = self.count(BLACK)
@@ -189,6 +208,23 @@ class Checkerboard:
 
     enemy = property(_get_enemy, doc="The color for the player that doesn't have the current turn")
 
+    def _start_incremental(self):
+        sq = self.squares
+        self._key = squares_key(sq)
+        self._terms = sum(EVAL_TERMS[i][sq[i]] for i in self.valid_squares) + TERM_BIASES
+        self._start_masks()
+
+    def _start_masks(self):
+        sq = self.squares
+        self._masks = sum(SQUARE_MASKS[i][sq[i]] for i in self.valid_squares)
+
+    def _get_hash_key(self):
+        if self._key is None:
+            self._start_incremental()
+        return self._key ^ SIDE_KEY if self.to_move == WHITE else self._key
+
+    hash_key = property(_get_hash_key, doc="64-bit Zobrist key of the position and side to move")
+
     def attach(self, observer):
         if observer not in self.observers:
             self.observers.append(observer)
@@ -203,6 +239,14 @@ class Checkerboard:
             s[6 + i] = s[12 + i] = s[17 + i] = FREE
             s[23 + i] = s[28 + i] = FREE
             s[34 + i] = s[39 + i] = s[45 + i] = FREE
+        self._key = self._masks = None
+
+    def set_position(self, squares, to_move):
+        """Copy a 56-entry square list (another board's squares, say) and the side to move onto the board."""
+        self.squares[:] = squares
+        self.to_move = to_move
+        self._key = self._masks = None
+        self.update_piece_count()
 
     def lookup(self, square):
         return self.char_lookup[square & TYPES]
@@ -243,10 +287,42 @@ class Checkerboard:
     def delete_redo_list(self):
         del self.redo_list[:]
 
-    def make_move(self, move, notify=True, undo=True, annotation=""):
+    def _apply_squares(self, move, reverse=False):
+        """Write move's new values onto the squares, or with reverse its old ones,
+        and keep up whichever of _key, _terms and _masks are live. Old values are
+        restored last square first, so a king that jumps back to its own square
+        ends up there."""
         sq = self.squares
-        for idx, _, new_value in move.affected_squares:
-            sq[idx] = new_value
+        if reverse:
+            # the same loops, run with each square's old and new values swapped
+            changes = [(idx, new_value, old_value) for idx, old_value, new_value in reversed(move.squares)]
+        else:
+            changes = move.squares
+        key = self._key
+        if key is None:
+            masks = self._masks
+            if masks is None:
+                for idx, _, new_value in changes:
+                    sq[idx] = new_value
+            else:
+                for idx, old_value, new_value in changes:
+                    sq[idx] = new_value
+                    masks ^= SQUARE_MASKS[idx][old_value] ^ SQUARE_MASKS[idx][new_value]
+                self._masks = masks
+        else:
+            terms = self._terms
+            masks = self._masks
+            for idx, old_value, new_value in changes:
+                sq[idx] = new_value
+                key ^= SQUARE_KEYS[idx][old_value] ^ SQUARE_KEYS[idx][new_value]
+                terms += EVAL_TERMS[idx][new_value] - EVAL_TERMS[idx][old_value]
+                masks ^= SQUARE_MASKS[idx][old_value] ^ SQUARE_MASKS[idx][new_value]
+            self._key = key
+            self._terms = terms
+            self._masks = masks
+
+    def make_move(self, move, notify=True, undo=True, annotation=""):
+        self._apply_squares(move)
         self.to_move ^= COLORS
 
         if notify:
@@ -258,14 +334,33 @@ class Checkerboard:
             self.undo_list.append(move)
         return self
 
+    def push_move(self, move):
+        """Search-only make_move: no observers, piece counts or undo history, and no allocation."""
+        self._apply_squares(move)
+        self.to_move ^= COLORS
+        self._search_stack[self._search_ply] = move
+        self._search_ply += 1
+
+    def pop_move(self):
+        """Take back the last push_move and return the move."""
+        self._search_ply -= 1
+        move = self._search_stack[self._search_ply]
+        self._apply_squares(move, reverse=True)
+        self.to_move ^= COLORS
+        return move
+
+    def _get_search_ply(self):
+        return self._search_ply
+
+    search_ply = property(_get_search_ply, doc="Number of push_move calls not yet taken back")
+
     def undo_move(self, move=None, notify=True, redo=True, annotation=""):
         if move is None:
             if not self.undo_list:
                 return
             if redo:
                 move = self.undo_list.pop()
-        rev_move = Move([[idx, dest, src] for idx, src, dest in move.affected_squares])
-        rev_move.annotation = move.annotation
+        rev_move = Move.from_tuples(tuple((idx, dest, src) for idx, src, dest in move.squares), move.annotation)
         self.make_move(rev_move, notify, False)
         if redo:
             move.annotation = annotation
@@ -274,8 +369,7 @@ class Checkerboard:
     def undo_all_moves(self, annotation=""):
         while self.undo_list:
             move = self.undo_list.pop()
-            rev_move = Move([[idx, dest, src] for idx, src, dest in move.affected_squares])
-            rev_move.annotation = move.annotation
+            rev_move = Move.from_tuples(tuple((idx, dest, src) for idx, src, dest in move.squares), move.annotation)
             self.make_move(rev_move, True, False)
             move.annotation = annotation
             self.redo_list.append(move)
@@ -300,9 +394,34 @@ class Checkerboard:
         self.redo_list = []
 
     def utility(self, player):
-        """Player evaluation function"""
+        """Player evaluation function.
+
+        The terms that are sums over the squares are kept up as moves are made
+        and taken back (see EVAL_TERMS), so only the few pattern terms look at
+        the board here. With an eval_cache, scores are looked up there first."""
+        if self._key is None:
+            self._start_incremental()
+        cache = self.eval_cache
+        if cache is None:
+            return self._evaluate(self._terms, player)
+        key = (self._key ^ SIDE_KEY if self.to_move == WHITE else self._key) << 2 | player
+        score = cache.probe(key)
+        if score is None:
+            score = self._evaluate(self._terms, player)
+            cache.store(key, score)
+        return score
+
+    def scan_utility(self, player):
+        """utility worked out from scratch in one pass over the board, for checking the incremental terms against."""
+        return self._evaluate(self._scan_terms(), player)
+
+    def _scan_terms(self):
+        sq = self.squares
+        return sum(EVAL_TERMS[i][sq[i]] for i in self.valid_squares) + TERM_BIASES
+
+    def _evaluate(self, terms, player):
         sq = self.squares
-        code = sum(self.value[s] for s in sq)
+        code = terms & TERM_MASK
         nwm = code % 16
         nwk = (code >> 4) % 16
         nbm = (code >> 8) % 16
@@ -326,132 +445,138 @@ class Checkerboard:
             evaluation -= TURN
             multiplier = 1
 
+        # black's system holds the squares 6-9 + 11j, white's the other 16
+        in_system = terms >> SYSTEM_SHIFT & TERM_MASK
+        if self.to_move != BLACK:
+            in_system = nm + nk - in_system
+        # no back rank guard: as first written (Checkerboard.rank times BRV, multiplied into an evaluation of 0)
+        # it always scored 0, so it is left out rather than kept up for nothing until it is put right
         return multiplier * (
             evaluation
             + self._eval_cramp(sq)
-            + self._eval_back_rank_guard(sq)
             + self._eval_double_corner(sq)
-            + self._eval_center(sq)
-            + self._eval_edge(sq)
-            + self._eval_tempo(sq, nm, nbk, nbm, nwk, nwm)
-            + self._eval_player_opposition(sq, nwm, nwk, nbk, nbm, nm, nk)
+            + ((terms >> CENTER_SHIFT & TERM_MASK) - TERM_BIAS)
+            + ((terms >> EDGE_SHIFT & TERM_MASK) - TERM_BIAS)
+            + self._tempo_score(sq, (terms >> TEMPO_SHIFT & TERM_MASK) - TERM_BIAS, nm, nbk, nbm, nwk, nwm)
+            + self._opposition_score(in_system, nwm, nwk, nbk, nbm, nm, nk)
         )
 
-    def _extend_capture(self, valid_moves, captures, add_sq_func, visited):
-        player = self.to_move
-        enemy = self.enemy
-        squares = self.squares
-        final_captures = []
-        capture = None
-        while captures:
-            c = captures.pop()
-            new_captures = []
-            for j in valid_moves:
-                capture = c.affected_squares[:]
-                last_pos = capture[-1][0]
-                mid = last_pos + j
-                dest = last_pos + j * 2
-                if (
-                    (last_pos, mid, dest) not in visited
-                    and (dest, mid, last_pos) not in visited
-                    and squares[mid] & enemy
-                    and squares[dest] & FREE
-                ):
-                    sq2, sq3 = add_sq_func(player, squares, mid, dest, last_pos)
-                    capture[-1][2] = FREE
-                    capture.extend([sq2, sq3])
-                    visited.add((last_pos, mid, dest))
-                    new_captures.append(Move(capture))
-            if new_captures:
-                captures.extend(new_captures)
-            else:
-                final_captures.append(Move(capture))
-        return final_captures
+    def _extend_capture(self, start, piece, steps, enemy, depth, visited, captures):
+        """Depth-first search of the jump chains that continue from the current path.
 
-    def _capture_man(self, player, squares, mid, dest, last_pos):
-        sq2 = [mid, squares[mid], FREE]
-        if (player == BLACK and last_pos >= 34) or (player == WHITE and last_pos <= 20):
-            sq3 = [dest, FREE, player | KING]
+        The path lives in the preallocated _capture_path stack as alternating
+        (captured square, landing square) entries; a Move is only built once a
+        chain can't be extended any further."""
+        squares = self.squares
+        path = self._capture_path
+        last_pos = path[depth - 1]
+        found = None
+        for j in steps:
+            mid = last_pos + j
+            dest = mid + j
+            if squares[mid] & enemy and squares[dest] & FREE:
+                key = last_pos * 64 + dest
+                if key not in visited and dest * 64 + last_pos not in visited:
+                    visited.add(key)
+                    if found is None:
+                        found = [mid, dest]
+                    else:
+                        found += (mid, dest)
+        if found is None:
+            captures.append(self._capture_move(start, piece, depth))
+            return
+        # later directions are searched first, as the original jump stack did
+        for k in range(len(found) - 2, -1, -2):
+            path[depth] = found[k]
+            path[depth + 1] = found[k + 1]
+            self._extend_capture(start, piece, steps, enemy, depth + 2, visited, captures)
+
+    def _capture_move(self, start, piece, depth):
+        squares = self.squares
+        path = self._capture_path
+        affected = [(start, piece, FREE)]
+        for k in range(0, depth - 2, 2):
+            mid = path[k]
+            affected.append((mid, squares[mid], FREE))
+            affected.append((path[k + 1], FREE, FREE))
+        mid = path[depth - 2]
+        dest = path[depth - 1]
+        player = piece & COLORS
+        if piece & KING or (player == BLACK and dest >= 45) or (player == WHITE and dest <= 9):
+            final = player | KING
         else:
-            sq3 = [dest, FREE, player | MAN]
-        return sq2, sq3
-
-    def _capture_king(self, player, squares, mid, dest, last_pos):
-        sq2 = [mid, squares[mid], FREE]
-        sq3 = [dest, squares[dest], player | KING]
-        return sq2, sq3
+            final = player | MAN
+        affected.append((mid, squares[mid], FREE))
+        affected.append((dest, FREE, final))
+        return Move.from_tuples(tuple(affected))
 
     def _get_captures(self):
         player = self.to_move
         enemy = self.enemy
         squares = self.squares
-        valid_indices = WHITE_IDX if player == WHITE else BLACK_IDX
+        man_steps = WHITE_IDX if player == WHITE else BLACK_IDX
+        path = self._capture_path
         all_captures = []
         for i in self.valid_squares:
-            if squares[i] & player and squares[i] & MAN:
-                for j in valid_indices:
-                    mid = i + j
-                    dest = i + j * 2
-                    if squares[mid] & enemy and squares[dest] & FREE:
-                        sq1 = [i, player | MAN, FREE]
-                        sq2 = [mid, squares[mid], FREE]
-                        if (player == BLACK and i >= 34) or (player == WHITE and i <= 20):
-                            sq3 = [dest, FREE, player | KING]
-                        else:
-                            sq3 = [dest, FREE, player | MAN]
-                        capture = [Move([sq1, sq2, sq3])]
-                        visited = set()
-                        visited.add((i, mid, dest))
-                        temp = squares[i]
-                        squares[i] = FREE
-                        captures = self._extend_capture(valid_indices, capture, self._capture_man, visited)
-                        squares[i] = temp
-                        all_captures.extend(captures)
-            if squares[i] & player and squares[i] & KING:
-                for j in KING_IDX:
-                    mid = i + j
-                    dest = i + j * 2
-                    if squares[mid] & enemy and squares[dest] & FREE:
-                        sq1 = [i, player | KING, FREE]
-                        sq2 = [mid, squares[mid], FREE]
-                        sq3 = [dest, squares[dest], player | KING]
-                        capture = [Move([sq1, sq2, sq3])]
-                        visited = set()
-                        visited.add((i, mid, dest))
-                        temp = squares[i]
-                        squares[i] = FREE
-                        captures = self._extend_capture(KING_IDX, capture, self._capture_king, visited)
-                        squares[i] = temp
-                        all_captures.extend(captures)
+            piece = squares[i]
+            if not piece & player:
+                continue
+            steps = KING_IDX if piece & KING else man_steps
+            for j in steps:
+                mid = i + j
+                dest = mid + j
+                if squares[mid] & enemy and squares[dest] & FREE:
+                    path[0] = mid
+                    path[1] = dest
+                    # the jumping piece leaves its square, so a king may land there again
+                    squares[i] = FREE
+                    self._extend_capture(i, piece, steps, enemy, 2, {i * 64 + dest}, all_captures)
+                    squares[i] = piece
         return all_captures
 
     captures = property(_get_captures, doc="Forced captures for the current player")
 
+    def bitmasks(self):
+        """The position as (black, white, kings) masks in game.bitboard's bit numbering."""
+        if self._masks is None:
+            self._start_masks()
+        masks = self._masks
+        return masks & FULL_MASK, masks >> WHITE_MASK_SHIFT & FULL_MASK, masks >> KINGS_MASK_SHIFT
+
+    def _get_piece_count(self):
+        if self._key is None:
+            self._start_incremental()
+        code = self._terms & TERM_MASK
+        return (code & 15) + (code >> 4 & 15) + (code >> 8 & 15) + (code >> 12 & 15)
+
+    piece_count = property(_get_piece_count, doc="Number of pieces on the board, both colors")
+
+    def iter_moves(self):
+        """Lazily yield the quiet moves for the current player."""
+        if self._masks is None:
+            self._start_masks()
+        masks = self._masks
+        black = masks & FULL_MASK
+        white = masks >> WHITE_MASK_SHIFT & FULL_MASK
+        own = black if self.to_move == BLACK else white
+        return quiet_moves(self.to_move, own, masks >> KINGS_MASK_SHIFT, ~(black | white) & FULL_MASK)
+
     def _get_moves(self):
-        player = self.to_move
-        squares = self.squares
-        valid_indices = WHITE_IDX if player == WHITE else BLACK_IDX
-        moves = []
-        for i in self.valid_squares:
-            for j in valid_indices:
-                dest = i + j
-                if squares[i] & player and squares[i] & MAN and squares[dest] & FREE:
-                    sq1 = [i, player | MAN, FREE]
-                    if (player == BLACK and i >= 39) or (player == WHITE and i <= 15):
-                        sq2 = [dest, FREE, player | KING]
-                    else:
-                        sq2 = [dest, FREE, player | MAN]
-                    moves.append(Move([sq1, sq2]))
-            for j in KING_IDX:
-                dest = i + j
-                if squares[i] & player and squares[i] & KING and squares[dest] & FREE:
-                    sq1 = [i, player | KING, FREE]
-                    sq2 = [dest, FREE, player | KING]
-                    moves.append(Move([sq1, sq2]))
-        return moves
+        return list(self.iter_moves())
 
     moves = property(_get_moves, doc="Available moves for the current player")
 
+    def _get_move_count(self):
+        if self._masks is None:
+            self._start_masks()
+        masks = self._masks
+        black = masks & FULL_MASK
+        white = masks >> WHITE_MASK_SHIFT & FULL_MASK
+        own = black if self.to_move == BLACK else white
+        return quiet_move_count(self.to_move, own, masks >> KINGS_MASK_SHIFT, ~(black | white) & FULL_MASK)
+
+    move_count = property(_get_move_count, doc="Number of quiet moves for the current player, none of them built")
+
     def _eval_cramp(self, sq):
         evaluation = 0
         if sq[28] == BLACK | MAN and sq[34] == WHITE | MAN:
@@ -460,32 +585,6 @@ class Checkerboard:
             evaluation -= CRAMP
         return evaluation
 
-    def _eval_back_rank_guard(self, sq):
-        evaluation = 0
-        code = 0
-        if sq[6] & MAN:
-            code += 1
-        if sq[7] & MAN:
-            code += 2
-        if sq[8] & MAN:
-            code += 4
-        if sq[9] & MAN:
-            code += 8
-        back_rank = self.rank[code]
-
-        code = 0
-        if sq[45] & MAN:
-            code += 8
-        if sq[46] & MAN:
-            code += 4
-        if sq[47] & MAN:
-            code += 2
-        if sq[48] & MAN:
-            code += 1
-        back_rank = back_rank - self.rank[code]
-        evaluation *= BRV * back_rank
-        return evaluation
-
     def _eval_double_corner(self, sq):
         evaluation = 0
         if sq[9] == BLACK | MAN and (sq[14] == (BLACK | MAN) or sq[15] == (BLACK | MAN)):
@@ -495,48 +594,8 @@ class Checkerboard:
             evaluation -= INTACT_DOUBLE_CORNER
         return evaluation
 
-    def _eval_center(self, sq):
-        evaluation = 0
-        nbmc = nbkc = nwmc = nwkc = 0
-        for c in self.center:
-            if sq[c] != FREE:
-                if sq[c] == BLACK | MAN:
-                    nbmc += 1
-                if sq[c] == BLACK | KING:
-                    nbkc += 1
-                if sq[c] == WHITE | MAN:
-                    nwmc += 1
-                if sq[c] == WHITE | KING:
-                    nwkc += 1
-        evaluation += (nbmc - nwmc) * MCV
-        evaluation += (nbkc - nwkc) * KCV
-        return evaluation
-
-    def _eval_edge(self, sq):
+    def _tempo_score(self, sq, tempo, nm, nbk, nbm, nwk, nwm):
         evaluation = 0
-        nbme = nbke = nwme = nwke = 0
-        for e in self.edge:
-            if sq[e] != FREE:
-                if sq[e] == BLACK | MAN:
-                    nbme += 1
-                if sq[e] == BLACK | KING:
-                    nbke += 1
-                if sq[e] == WHITE | MAN:
-                    nwme += 1
-                if sq[e] == WHITE | KING:
-                    nwke += 1
-        evaluation -= (nbme - nwme) * MEV
-        evaluation -= (nbke - nwke) * KEV
-        return evaluation
-
-    def _eval_tempo(self, sq, nm, nbk, nbm, nwk, nwm):
-        evaluation = tempo = 0
-        for i in range(6, 49):
-            if sq[i] == BLACK | MAN:
-                tempo += self.row[i]
-            if sq[i] == WHITE | MAN:
-                tempo -= 7 - self.row[i]
-
         if nm >= 16:
             evaluation += OPENING * tempo
         if 15 >= nm >= 12:
@@ -551,16 +610,12 @@ class Checkerboard:
                 evaluation += 15
         return evaluation
 
-    def _eval_player_opposition(self, sq, nwm, nwk, nbk, nbm, nm, nk):
+    def _opposition_score(self, pieces_in_system, nwm, nwk, nbk, nbm, nm, nk):
+        """Opposition term given the number of pieces in the system of the side to move."""
         evaluation = 0
-        pieces_in_system = 0
         tn = nm + nk
         if nwm + nwk - nbk - nbm == 0:
             if self.to_move == BLACK:
-                for i in range(6, 10):
-                    for j in range(4):
-                        if sq[i + 11 * j] != FREE:
-                            pieces_in_system += 1
                 if pieces_in_system % 2:
                     if tn <= 12:
                         evaluation += 1
@@ -580,10 +635,6 @@ class Checkerboard:
                     if tn <= 6:
                         evaluation -= 2
             else:
-                for i in range(12, 16):
-                    for j in range(4):
-                        if sq[i + 11 * j] != FREE:
-                            pieces_in_system += 1
                 if pieces_in_system % 2 == 0:
                     if tn <= 12:
                         evaluation += 1
@@ -605,10 +656,78 @@ class Checkerboard:
         return evaluation
 
 
+# Piece-square tables, TABLE[square][piece], for the evaluation terms that
+# are sums over the squares.
+
+
+def _piece_square_table(score):
+    valid = Checkerboard.valid_squares
+    return [[score(idx, piece) if idx in valid else 0 for piece in range(FREE + 1)] for idx in range(56)]
+
+
+_CENTER_VALUES = {BLACK | MAN: MCV, BLACK | KING: KCV, WHITE | MAN: -MCV, WHITE | KING: -KCV}
+_EDGE_VALUES = {BLACK | MAN: -MEV, BLACK | KING: -KEV, WHITE | MAN: MEV, WHITE | KING: KEV}
+
+CENTER_TABLE = _piece_square_table(lambda idx, piece: _CENTER_VALUES.get(piece, 0) if idx in Checkerboard.center else 0)
+EDGE_TABLE = _piece_square_table(lambda idx, piece: _EDGE_VALUES.get(piece, 0) if idx in Checkerboard.edge else 0)
+TEMPO_TABLE = _piece_square_table(
+    lambda idx, piece: {BLACK | MAN: Checkerboard.row[idx], WHITE | MAN: Checkerboard.row[idx] - 7}.get(piece, 0)
+)
+# pieces in black's system, the squares 6-9 + 11j
+SYSTEM_TABLE = _piece_square_table(lambda idx, piece: 1 if piece & COLORS and (idx - 6) % 11 < 4 else 0)
+
+# All of them, and the material code of Checkerboard.value, packed into one
+# integer of 16-bit fields so that keeping them up through a move is one
+# addition per square it changes. The fields that can go negative are offset
+# by TERM_BIAS.
+TERM_MASK = 0xFFFF
+TERM_BIAS = 1 << 15
+CENTER_SHIFT = 16
+EDGE_SHIFT = 32
+TEMPO_SHIFT = 48
+SYSTEM_SHIFT = 64
+TERM_BIASES = TERM_BIAS << CENTER_SHIFT | TERM_BIAS << EDGE_SHIFT | TERM_BIAS << TEMPO_SHIFT
+
+# EVAL_TERMS[square][piece]: what a piece on a square adds to Checkerboard._terms
+EVAL_TERMS = [
+    [
+        Checkerboard.value[piece]
+        + (CENTER_TABLE[idx][piece] << CENTER_SHIFT)
+        + (EDGE_TABLE[idx][piece] << EDGE_SHIFT)
+        + (TEMPO_TABLE[idx][piece] << TEMPO_SHIFT)
+        + (SYSTEM_TABLE[idx][piece] << SYSTEM_SHIFT)
+        for piece in range(FREE + 1)
+    ]
+    for idx in range(56)
+]
+
+WHITE_MASK_SHIFT = 32
+KINGS_MASK_SHIFT = 64
+
+
+def _square_mask(idx, piece):
+    bit = BITS.get(idx, 0)
+    mask = bit if piece & BLACK else bit << WHITE_MASK_SHIFT if piece & WHITE else 0
+    return mask | bit << KINGS_MASK_SHIFT if piece & KING else mask
+
+
+# SQUARE_MASKS[square][piece]: the bits a piece on a square sets in Checkerboard._masks, which packs
+# the black, white and kings masks of game.bitboard as black | white << 32 | kings << 64
+SQUARE_MASKS = [[_square_mask(idx, piece) for piece in range(FREE + 1)] for idx in range(56)]
+
+
 class Checkers(games.Game):
-    def __init__(self):
+    def __init__(self, bitboard=False, eval_cache_size=0):
+        """bitboard selects the mask-based Bitboard state instead of the
+        square-list Checkerboard; both share the same move and search surface.
+        A Checkerboard caches eval_cache_size of its evaluations, if any; a
+        Bitboard has no cache, so asking for one with it raises ValueError."""
+        if eval_cache_size and bitboard:
+            raise ValueError("a Bitboard has no evaluation cache")
         games.Game.__init__(self)
-        self.curr_state = Checkerboard()
+        self.curr_state = Bitboard() if bitboard else Checkerboard()
+        if eval_cache_size:
+            self.curr_state.eval_cache = EvalCache(eval_cache_size)
 
     def captures_available(self, curr_state=None):
         state = curr_state or self.curr_state
@@ -618,6 +737,11 @@ class Checkers(games.Game):
         state = curr_state or self.curr_state
         return state.captures or state.moves
 
+    def legal_move_count(self, curr_state=None):
+        """len(legal_moves), without building the quiet moves."""
+        state = curr_state or self.curr_state
+        return len(state.captures) or state.move_count
+
     def make_move(self, move, curr_state=None, notify=True, undo=True, annotation=""):
         state = curr_state or self.curr_state
         return state.make_move(move, notify, undo, annotation)
@@ -642,14 +766,21 @@ class Checkers(games.Game):
         state = curr_state or self.curr_state
         return state.utility(player)
 
+    def hash_key(self, curr_state=None):
+        state = curr_state or self.curr_state
+        return state.hash_key
+
     def terminal_test(self, curr_state=None):
         state = curr_state or self.curr_state
         return not self.legal_moves(state)
 
-    def successors(self, curr_state=None):
+    def successors(self, curr_state=None, moves=None):
+        """Yield (move, state) for each legal move (or each of moves, in that order),
+        with the move made on state for the duration of the yield."""
         move = None
         state = curr_state or self.curr_state
-        moves = self.legal_moves(state)
+        if moves is None:
+            moves = self.legal_moves(state)
         if not moves:
             yield [], state
         else:
@@ -658,15 +789,15 @@ class Checkers(games.Game):
                 try:
                     for move in moves:
                         undone = False
-                        self.make_move(move, state, False)
+                        state.push_move(move)
                         yield move, state
-                        self.undo_move(move, state, False)
+                        state.pop_move()
                         undone = True
                 except GeneratorExit:
                     raise
             finally:
                 if moves and not undone:
-                    self.undo_move(move, state, False)
+                    state.pop_move()
 
     def perft(self, depth, curr_state=None):
         if depth == 0:
@@ -675,9 +806,9 @@ class Checkers(games.Game):
         state = curr_state or self.curr_state
         nodes = 0
         for move in self.legal_moves(state):
-            state.make_move(move, False, False)
+            state.push_move(move)
             nodes += self.perft(depth - 1, state)
-            state.undo_move(move, False, False)
+            state.pop_move()
         return nodes
 
 
@@ -0,0 +1,44 @@
+"""Fixed-size cache of position evaluations.
+
+The search evaluates the same leaves over and over, on every pass of
+iterative deepening and wherever moves transpose. Checkerboard.utility looks
+a position up here, by its Zobrist key and the player it is scored for, before
+working the score out. Each key has one slot and a new entry overwrites
+whatever was in it."""
+
+from util.globalconst import EVAL_CACHE_SIZE
+
+
+class EvalCache:
+    def __init__(self, size=EVAL_CACHE_SIZE):
+        slots = 1
+        while slots < size:
+            slots <<= 1
+        self._mask = slots - 1
+        self._keys = [None] * slots
+        self._scores = [0] * slots
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        slots = len(self._keys)
+        self._keys = [None] * slots
+        self._scores = [0] * slots
+        self.hits = self.misses = 0
+
+    def probe(self, key):
+        """Return the score stored for key, or None."""
+        idx = key & self._mask
+        if self._keys[idx] == key:
+            self.hits += 1
+            return self._scores[idx]
+        self.misses += 1
+        return None
+
+    def store(self, key, score):
+        idx = key & self._mask
+        self._keys[idx] = key
+        self._scores[idx] = score
@@ -0,0 +1,207 @@
+"""Perft: counting the positions a fixed number of plies ahead, to check the
+move generator against known counts. Run it as python -m game.perft.
+
+The count under a position depends only on the position and the depth, so
+with a PerftTable each (position, depth) is counted once and looked up every
+time another order of moves transposes into it. divide gives the count under
+each move from the root, which is what narrows a wrong total down to the move
+the generator gets wrong. parallel_perft shares the counting out among
+processes. By default the last ply is bulk-counted: a position one ply from
+the end contributes its number of legal moves, with the quiet ones counted
+from the move generator's masks rather than built and played."""
+
+import argparse
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from game.bitboard import Bitboard
+from game.checkers import Checkers
+from util.globalconst import keymap
+
+TABLE_SIZE = 1 << 22  # slots, 16 bytes each
+SPLIT_DEPTH = 3  # plies parallel_perft goes down before handing the subtrees out
+DEPTH_BITS = 6
+DEPTH_MASK = (1 << DEPTH_BITS) - 1
+
+
+class PerftTable:
+    """Fixed-size (position key, depth) -> count table; a new entry overwrites
+    whatever shares its slot."""
+
+    def __init__(self, size=TABLE_SIZE):
+        slots = 1
+        while slots < size:
+            slots <<= 1
+        self._mask = slots - 1
+        self._keys = array("Q", bytes(8 * slots))
+        self._counts = array("Q", bytes(8 * slots))  # count << DEPTH_BITS | depth; 0 in an empty slot
+        self.probes = 0
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def probe(self, key, depth):
+        """Return the count stored for key at depth, or None."""
+        self.probes += 1
+        idx = (key + depth) & self._mask
+        data = self._counts[idx]
+        if data & DEPTH_MASK == depth and self._keys[idx] == key:
+            self.hits += 1
+            return data >> DEPTH_BITS
+        return None
+
+    def store(self, key, depth, count):
+        idx = (key + depth) & self._mask
+        self._keys[idx] = key
+        self._counts[idx] = count << DEPTH_BITS | depth
+
+
+def perft(game, depth, state=None, table=None, bulk=True):
+    """Count the positions depth plies on from state (the game's current one by
+    default). With a table, subtree counts are looked up and stored there.
+    With bulk, the last ply is counted with legal_move_count instead of by
+    playing each move."""
+    state = state or game.curr_state
+    if table is None and not bulk:
+        return game.perft(depth, state)
+    return _perft(game, state, depth, table, bulk)
+
+
+def _perft(game, state, depth, table, bulk):
+    if depth == 1 and bulk:
+        return game.legal_move_count(state)
+    if depth == 0:
+        return 1
+    if table is not None:
+        key = state.hash_key
+        count = table.probe(key, depth)
+        if count is not None:
+            return count
+    count = 0
+    for move in game.legal_moves(state):
+        state.push_move(move)
+        count += _perft(game, state, depth - 1, table, bulk)
+        state.pop_move()
+    if table is not None:
+        table.store(key, depth, count)
+    return count
+
+
+def parallel_perft(game, depth, state=None, workers=None, split_depth=SPLIT_DEPTH, table_size=TABLE_SIZE, bulk=True):
+    """perft counted by a pool of workers processes (by default one per CPU).
+    The positions split_depth plies on are counted as separate tasks, each
+    process with a table of table_size slots of its own (0 for none), and a
+    position reached by more than one order of moves is counted only once."""
+    workers = workers or os.cpu_count() or 1
+    state = state or game.curr_state
+    split_depth = min(split_depth, depth)
+    frontier = {}
+    _split(game.legal_moves, state, split_depth, frontier)
+    tasks = [(list(squares), to_move, depth - split_depth) for squares, to_move in frontier]
+    bitboard = state.__class__ is Bitboard
+    with ProcessPoolExecutor(workers, initializer=_init_perft, initargs=(bitboard, table_size, bulk)) as pool:
+        counts = pool.map(_subtree_perft, tasks, chunksize=max(1, len(tasks) // (8 * workers)))
+        return sum(count * times for count, times in zip(counts, frontier.values(), strict=True))
+
+
+def _split(legal_moves, state, depth, frontier):
+    """Fill frontier with (squares, to_move) -> times reached for the positions depth plies on.
+    They are told apart by the squares themselves, not a hash that two of them could share."""
+    if depth == 0:
+        position = tuple(state.squares), state.to_move
+        frontier[position] = frontier.get(position, 0) + 1
+        return
+    for move in legal_moves(state):
+        state.push_move(move)
+        _split(legal_moves, state, depth - 1, frontier)
+        state.pop_move()
+
+
+_perft_game = None
+_perft_table = None
+_perft_bulk = True
+
+
+def _init_perft(bitboard, table_size, bulk):
+    global _perft_game, _perft_table, _perft_bulk
+    _perft_game = Checkers(bitboard=bitboard)
+    _perft_table = PerftTable(table_size) if table_size else None
+    _perft_bulk = bulk
+
+
+def _subtree_perft(task):
+    squares, to_move, depth = task
+    state = _perft_game.curr_state
+    state.set_position(squares, to_move)
+    return perft(_perft_game, depth, state, _perft_table, _perft_bulk)
+
+
+def divide(game, depth, state=None, table=None, workers=1, bulk=True):
+    """Return (move, count) for each legal move from state, count being the perft
+    of depth - 1 after it; the counts add up to perft(game, depth, state).
+    With more than one worker, each count is a parallel_perft."""
+    state = state or game.curr_state
+    counts = []
+    for move in game.legal_moves(state):
+        state.push_move(move)
+        if workers > 1:
+            table_size = len(table) if table is not None else 0
+            count = parallel_perft(game, depth - 1, state, workers, table_size=table_size, bulk=bulk)
+        else:
+            count = perft(game, depth - 1, state, table, bulk)
+        counts.append((move, count))
+        state.pop_move()
+    return counts
+
+
+def move_text(move):
+    """The move in the usual notation, e.g. 11-15 or 15x24x31."""
+    if move.jumps:
+        return "x".join(str(keymap[idx]) for idx, _, _ in (move.squares[0], *move.squares[2::2]))
+    return f"{keymap[move.origin]}-{keymap[move.destination]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game.perft", description=__doc__.splitlines()[0])
+    parser.add_argument("depth", type=int, help="count to this depth, reporting every depth on the way")
+    parser.add_argument("--divide", action="store_true", help="list the count under each root move at the last depth")
+    parser.add_argument(
+        "--table-size", type=int, default=TABLE_SIZE, help=f"perft table slots, 0 for none (default {TABLE_SIZE})"
+    )
+    parser.add_argument("--bitboard", action="store_true", help="count on a Bitboard instead of a Checkerboard")
+    parser.add_argument("--workers", type=int, default=1, help="processes to count with (default 1)")
+    parser.add_argument(
+        "--split-depth",
+        type=int,
+        default=SPLIT_DEPTH,
+        help=f"plies down to share the tree out at (default {SPLIT_DEPTH})",
+    )
+    parser.add_argument(
+        "--bulk",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="count the last ply without playing its moves (default on)",
+    )
+    args = parser.parse_args(argv)
+
+    game = Checkers(bitboard=args.bitboard)
+    table = PerftTable(args.table_size) if args.table_size else None
+    for depth in range(1, args.depth + 1):
+        start = time.time()
+        if args.divide and depth == args.depth:
+            counts = divide(game, depth, table=table, workers=args.workers, bulk=args.bulk)
+            for move, count in counts:
+                print(f"{move_text(move):<12} {count}")
+            nodes = sum(count for _, count in counts)
+        elif args.workers > 1:
+            nodes = parallel_perft(game, depth, None, args.workers, args.split_depth, args.table_size, args.bulk)
+        else:
+            nodes = perft(game, depth, table=table, bulk=args.bulk)
+        print(f"Perft for depth {depth}: {nodes}. Time: {time.time() - start:.3f} sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Perft regression suite: known-good counts for the start position and a few
+tactical and king positions. Run it as python -m game.perftsuite.
+
+The start position's counts are the published ones. The others were counted
+by Checkers.perft and agree with the separate Bitboard move generator. The
+suite runs depth by depth across all the positions, so that a short time
+budget still checks every position at the shallow depths. Within a round, a
+depth that would take longer than the budget has left is skipped, judged by
+how long the previous depth took and how much the reference count grows.
+Each run reports nodes per second, and the whole report can be written as
+JSON to compare one change of the board code against another."""
+
+import argparse
+import json
+import sys
+import time
+from typing import NamedTuple
+
+from game.checkers import Checkerboard, Checkers
+from game.perft import TABLE_SIZE, PerftTable, perft
+from util.globalconst import BLACK, FREE, KING, MAN, WHITE, square_map
+
+BUDGET = 60  # seconds
+
+
+class SuitePosition(NamedTuple):
+    name: str
+    fen: str  # as in a PDN FEN tag
+    counts: tuple  # perft of depth 1, 2, ...
+
+
+SUITE = (
+    SuitePosition(
+        "start",
+        "B:W21,22,23,24,25,26,27,28,29,30,31,32:B1,2,3,4,5,6,7,8,9,10,11,12",
+        (7, 49, 302, 1469, 7361, 36768, 179740, 845931, 3963680, 18391564, 85242128),
+    ),
+    SuitePosition(
+        "kings",
+        "W:WK18,K22,K26:BK5,K9,14",
+        (7, 19, 103, 460, 2763, 12785, 82366, 431896, 2984390),
+    ),
+    SuitePosition(
+        "multi-jumps",
+        "B:W6,7,14,15,22,23,24:B1,2,K3",
+        (9, 50, 105, 443, 2228, 10724, 53063, 270948, 1332706),
+    ),
+    SuitePosition(
+        "crowning",
+        "B:W5,6,23:B12,26,27",
+        (5, 25, 105, 432, 2073, 9357, 46817, 232466, 1332275),
+    ),
+    SuitePosition(
+        "middlegame",
+        "B:W18,24,27,28,K10,K15:B12,16,20,K22,K25,K29",
+        (5, 38, 178, 1378, 5836, 40745, 197933, 1377007),
+    ),
+)
+
+
+def position_from_fen(fen):
+    """(squares, to_move) for a PDN FEN string such as W:W21,K30:B5,K9."""
+    turn, *sides = fen.split(":")
+    squares = list(Checkerboard().squares)
+    for idx in Checkerboard.valid_squares:
+        squares[idx] = FREE
+    for side in sides:
+        color = WHITE if side[0].upper() == "W" else BLACK
+        for item in side[1:].split(","):
+            if item.upper().startswith("K"):
+                squares[square_map[int(item[1:])]] = color | KING
+            elif item:
+                squares[square_map[int(item)]] = color | MAN
+    return squares, WHITE if turn.upper() == "W" else BLACK
+
+
+def run_suite(budget=BUDGET, max_depth=None, bitboard=False, table_size=TABLE_SIZE, bulk=True, positions=SUITE):
+    """Run the suite and return one dict per (position, depth): its name,
+    depth, expected and counted nodes, whether they agree, the seconds taken
+    and nodes per second. Depths that didn't fit in budget seconds are left out."""
+    start = time.perf_counter()
+    games = []
+    for position in positions:
+        game = Checkers(bitboard=bitboard)
+        game.curr_state.set_position(*position_from_fen(position.fen))
+        games.append(game)
+    last_time = [0.0] * len(positions)
+    results = []
+    for depth in range(1, max(len(position.counts) for position in positions) + 1):
+        if max_depth is not None and depth > max_depth:
+            break
+        for i, (position, game) in enumerate(zip(positions, games, strict=True)):
+            if depth > len(position.counts) or last_time[i] is None:
+                continue
+            expected = position.counts[depth - 1]
+            growth = expected / position.counts[depth - 2] if depth > 1 else 1
+            if last_time[i] * growth > budget - (time.perf_counter() - start):
+                last_time[i] = None  # out of time for this position
+                continue
+            table = PerftTable(table_size) if table_size else None
+            run_start = time.perf_counter()
+            nodes = perft(game, depth, table=table, bulk=bulk)
+            seconds = time.perf_counter() - run_start
+            last_time[i] = seconds
+            results.append(
+                {
+                    "position": position.name,
+                    "depth": depth,
+                    "expected": expected,
+                    "nodes": nodes,
+                    "ok": nodes == expected,
+                    "seconds": seconds,
+                    "nps": nodes / seconds if seconds else 0.0,
+                }
+            )
+    return results
+
+
+def summarize(results):
+    nodes = sum(result["nodes"] for result in results)
+    seconds = sum(result["seconds"] for result in results)
+    return {
+        "runs": len(results),
+        "failed": sum(not result["ok"] for result in results),
+        "nodes": nodes,
+        "seconds": seconds,
+        "nps": nodes / seconds if seconds else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m game.perftsuite", description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=BUDGET, help=f"seconds to spend (default {BUDGET})")
+    parser.add_argument("--max-depth", type=int, help="deepest depth to run")
+    parser.add_argument("--bitboard", action="store_true", help="count on a Bitboard instead of a Checkerboard")
+    parser.add_argument(
+        "--table-size", type=int, default=TABLE_SIZE, help=f"perft table slots, 0 for none (default {TABLE_SIZE})"
+    )
+    parser.add_argument(
+        "--bulk",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="count the last ply without playing its moves (default on)",
+    )
+    parser.add_argument("--json", metavar="FILE", help="also write the report as JSON to FILE (- for stdout)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.budget, args.max_depth, args.bitboard, args.table_size, args.bulk)
+    summary = summarize(results)
+    if args.json != "-":
+        for result in results:
+            status = "ok" if result["ok"] else f"FAILED, expected {result['expected']}"
+            print(
+                f"{result['position']:<12} depth {result['depth']:>2} {result['nodes']:>12} "
+                f"{result['seconds']:8.3f} sec {result['nps']:>12,.0f} nps  {status}"
+            )
+        print(f"{summary['runs']} runs, {summary['failed']} failed, {summary['nps']:,.0f} nps overall")
+    if args.json:
+        report = {
+            "settings": {
+                "budget": args.budget,
+                "max_depth": args.max_depth,
+                "bitboard": args.bitboard,
+                "table_size": args.table_size,
+                "bulk": args.bulk,
+            },
+            "results": results,
+            "summary": summary,
+        }
+        if args.json == "-":
+            json.dump(report, sys.stdout, indent=2)
+        else:
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Zobrist keys for checkers positions.
+
+A position key is the XOR of one random 64-bit number per occupied square
+(chosen by square index and piece) plus SIDE_KEY when White is to move. Because
+XOR is its own inverse, a move updates the key by XOR-ing out the old value and
+XOR-ing in the new value of each square it changes. The numbers come from a
+fixed seed so keys are stable between runs and between processes."""
+
+import random
+
+from util.globalconst import BLACK, KING, MAN, WHITE
+
+SEED = 0x5EED_C4EC
+NUM_SQUARES = 56
+PIECES = (BLACK | MAN, WHITE | MAN, BLACK | KING, WHITE | KING)
+
+
+def _make_keys():
+    rng = random.Random(SEED)
+    # indexed [square][piece value]; FREE, OCCUPIED and other codes stay 0
+    keys = [[0] * 32 for _ in range(NUM_SQUARES)]
+    for sq in range(NUM_SQUARES):
+        for piece in PIECES:
+            keys[sq][piece] = rng.getrandbits(64)
+    return keys, rng.getrandbits(64)
+
+
+SQUARE_KEYS, SIDE_KEY = _make_keys()
+
+
+def squares_key(squares):
+    """Key of a 56-entry square list, not including the side to move."""
+    key = 0
+    for sq, piece in enumerate(squares):
+        key ^= SQUARE_KEYS[sq][piece]
+    return key
+
+
+def move_delta(move):
+    """What XOR-ing into a square key applies (or, applied again, takes back) the move."""
+    delta = 0
+    for idx, old, new in move.squares:
+        delta ^= SQUARE_KEYS[idx][old] ^ SQUARE_KEYS[idx][new]
+    return delta
@@ -1,10 +1,6 @@
-import copy
-import multiprocessing
-import time
-
-import ai.games as games
+from ai.worker import shared_worker
 from base.controller import Controller
-from util.globalconst import DARK_SQUARES, MAX_DEPTH, OUTLINE_COLOR
+from util.globalconst import DARK_SQUARES, OUTLINE_COLOR, PONDER, SEARCH_WORKERS
 
 
 class AlphaBetaController(Controller):
@@ -14,11 +10,12 @@ class AlphaBetaController(Controller):
         self._end_turn_event = props["end_turn_event"]
         self._highlights = []
         self._search_time = props["searchtime"]  # in seconds
+        self._ponder = props.get("ponder", PONDER)  # think on the opponent's time
         self._before_turn_event = None
-        self._parent_conn, self._child_conn = multiprocessing.Pipe()
-        self._term_event = multiprocessing.Event()
-        self.process = multiprocessing.Process()
-        self._start_time = None
+        # the engine process outlives the controller; a new controller means a new game or setup
+        self._worker = shared_worker(props.get("workers", SEARCH_WORKERS))
+        self._worker.new_game()
+        self._request_id = None
         self._call_id = 0
 
     def set_before_turn_event(self, evt):
@@ -38,27 +35,25 @@ class AlphaBetaController(Controller):
             self._model.curr_state.attach(self._view)
             return
         self._view.update_statusbar("Thinking ...")
-        self.process = multiprocessing.Process(
-            target=calc_move, args=(self._model, self._search_time, self._term_event, self._child_conn)
-        )
-        self._start_time = time.time()
-        self.process.daemon = True
-        self.process.start()
-        self._view.canvas.after(100, self.get_move)
+        state = self._model.curr_state
+        self._request_id = self._worker.search(state.squares, state.to_move, self._search_time, self._ponder)
+        self._call_id = self._view.canvas.after(100, self.get_move)
 
     def get_move(self):
         self._highlights = []
-        moved = self._parent_conn.poll()
-        while not moved and (time.time() - self._start_time) < self._search_time * 2:
-            self._call_id = self._view.canvas.after(500, self.get_move)
+        done, move = self._worker.result(self._request_id)
+        if not done:
+            # the engine keeps to search_time itself, so just check back shortly
+            self._call_id = self._view.canvas.after(100, self.get_move)
+            return
+        self._call_id = 0
+        if move is None:  # the search was stopped
             return
-        self._view.canvas.after_cancel(self._call_id)
-        move = self._parent_conn.recv()
         self._before_turn_event()
 
         # highlight remaining board squares used in move
-        step = 2 if len(move.affected_squares) > 2 else 1
-        for m in move.affected_squares[0::step]:
+        step = 2 if len(move.squares) > 2 else 1
+        for m in move.squares[0::step]:
             idx = m[0]
             self._view.highlight_square(idx, OUTLINE_COLOR)
             self._highlights.append(idx)
@@ -73,47 +68,11 @@ class AlphaBetaController(Controller):
         self._search_time = tm  # in seconds
 
     def stop_process(self):
-        self._term_event.set()
+        self._worker.stop()
         if self._call_id != 0:
             self._view.canvas.after_cancel(self._call_id)
+            self._call_id = 0
 
     def end_turn(self):
         self._view.update_statusbar()
         self._model.curr_state.detach(self._view)
-
-
-def longest_of(moves):
-    length = -1
-    selected = None
-    for move in moves:
-        current_length = len(move.affected_squares)
-        if current_length > length:
-            length = current_length
-            selected = move
-    return selected
-
-
-def calc_move(model, search_time, term_event, child_conn):
-    term_event.clear()
-    captures = model.captures_available()
-    if captures:
-        time.sleep(0.7)
-        move = longest_of(captures)
-    else:
-        depth = 0
-        start_time = time.time()
-        curr_time = start_time
-        model_copy = copy.deepcopy(model)
-        while 1:
-            depth += 1
-            move = games.alphabeta_search(model_copy.curr_state, model_copy, depth)
-            checkpoint = curr_time
-            curr_time = time.time()
-            rem_time = search_time - (curr_time - checkpoint)
-            if term_event.is_set():  # a signal means terminate
-                term_event.clear()
-                move = None
-                break
-            if curr_time - start_time > search_time or ((curr_time - checkpoint) * 2) > rem_time or depth > MAX_DEPTH:
-                break
-    child_conn.send(move)
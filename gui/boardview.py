@@ -378,7 +378,7 @@ class BoardView(Observer):
     def notify(self, move):
         add_lst = []
         rem_lst = []
-        for idx, _, new_val in move.affected_squares:
+        for idx, _, new_val in move.squares:
             if new_val & FREE:
                 rem_lst.append(idx)
             else:
@@ -389,8 +389,8 @@ class BoardView(Observer):
         self.serializer.restore(move.annotation)
         self.curr_annotation = move.annotation
         if self.txt.get("1.0", "end").strip() == "":
-            start = keymap[move.affected_squares[FIRST][0]]
-            dest = keymap[move.affected_squares[LAST][0]]
+            start = keymap[move.squares[FIRST][0]]
+            dest = keymap[move.squares[LAST][0]]
             move_str = f"{start}-{dest}"
             self.txt.insert("1.0", move_str)
 
@@ -91,14 +91,14 @@ class PlayerController(Controller):
     def _filter_moves(self, pos, moves, idx):
         del_list = []
         for i, m in enumerate(moves):
-            if pos != m.affected_squares[idx][0]:
+            if pos != m.squares[idx][0]:
                 del_list.append(i)
         for i in reversed(del_list):
             del moves[i]
         return moves
 
     def _make_move(self):
-        move = self.moves[0].affected_squares
+        move = self.moves[0].squares
         step = 2 if len(move) > 2 else 1
         # highlight remaining board squares used in move
         for m in move[step::step]:
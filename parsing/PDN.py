@@ -408,9 +408,7 @@ class PDNReader:
         # try to match squares with available moves on checkerboard
         sq_len = len(squares)
         for move in legal_moves:
-            if sq_len == len(move.affected_squares) and all(
-                sq == move.affected_squares[i][0] for i, sq in enumerate(board_squares)
-            ):
+            if sq_len == len(move.squares) and all(sq == move.squares[i][0] for i, sq in enumerate(board_squares)):
                 move.annotation = annotation
                 self._model.make_move(move, state_copy, False, False)
                 return move
@@ -420,7 +418,7 @@ class PDNReader:
         if self._model.captures_available(state_copy):
             legal_moves = self._model.legal_moves(state_copy)
             for move in legal_moves:
-                if all(sq == move.affected_squares[i * 2][0] for i, sq in enumerate(board_squares)):
+                if all(sq == move.squares[i * 2][0] for i, sq in enumerate(board_squares)):
                     move.annotation = annotation
                     self._model.make_move(move, state_copy, False, False)
                     return move
@@ -779,17 +777,17 @@ def board_to_PDN_ready(board_moves: list[Move]):
     pdn_moves = []
     annotations = []
     for _idx, move in enumerate(board_moves):
-        num_squares = len(move.affected_squares)
+        num_squares = len(move.squares)
         if num_squares == 2:  # move
-            sq1 = keymap[move.affected_squares[0][0]]
-            sq2 = keymap[move.affected_squares[1][0]]
+            sq1 = keymap[move.squares[0][0]]
+            sq2 = keymap[move.squares[1][0]]
             pdn_moves.append([sq1, sq2])
         elif num_squares >= 3:  # jump
             jump = []
             for i in range(0, num_squares - 2, 2):
-                sq = keymap[move.affected_squares[i][0]]
+                sq = keymap[move.squares[i][0]]
                 jump.append(sq)
-            sq = keymap[move.affected_squares[-1][0]]
+            sq = keymap[move.squares[-1][0]]
             jump.append(sq)
             pdn_moves.append(jump)
         else:
@@ -0,0 +1,180 @@
+import random
+
+import pytest
+
+import game.checkers as checkers
+from base.move import Move
+from game.bitboard import (
+    FULL_MASK,
+    Bitboard,
+    BitMove,
+    _from_minus_5,
+    _from_minus_6,
+    _from_plus_5,
+    _from_plus_6,
+    quiet_move_count,
+    shift,
+)
+from game.zobrist import SIDE_KEY
+from util.globalconst import BLACK, KING, MAN, WHITE
+
+# --- helpers ---------------------------------------------------------------
+
+
+def setup_position(game: checkers.Checkers, to_move: int, placements: dict[int, int]):
+    board = game.curr_state
+    board.clear()
+    board.to_move = to_move
+    for idx, piece in placements.items():
+        board.squares[idx] = piece
+    return board
+
+
+def as_lists(moves):
+    return [m.affected_squares for m in moves]
+
+
+POSITIONS = [
+    dict(name="quiet_men", to_move=BLACK, placements={12: BLACK | MAN, 15: BLACK | MAN, 41: WHITE | MAN}),
+    dict(name="crowning_move", to_move=BLACK, placements={39: BLACK | MAN, 18: WHITE | MAN}),
+    dict(
+        name="crowning_jump_ends_turn",
+        to_move=BLACK,
+        placements={12: BLACK | MAN, 18: WHITE | MAN, 30: WHITE | MAN, 41: WHITE | MAN, 40: WHITE | MAN},
+    ),
+    dict(
+        name="king_diamond",
+        to_move=BLACK,
+        placements={13: BLACK | KING, 19: WHITE | MAN, 30: WHITE | MAN, 29: WHITE | MAN, 18: WHITE | MAN},
+    ),
+    dict(
+        name="white_multijump",
+        to_move=WHITE,
+        placements={41: WHITE | MAN, 36: BLACK | MAN, 35: BLACK | MAN, 23: BLACK | MAN},
+    ),
+    dict(
+        name="edge_pressure",
+        to_move=WHITE,
+        placements={45: WHITE | KING, 39: BLACK | MAN, 40: BLACK | MAN, 9: BLACK | KING, 12: WHITE | MAN},
+    ),
+]
+
+
+@pytest.mark.parametrize("case", POSITIONS, ids=lambda c: c["name"])
+def test_bitboard_matches_checkerboard_moves_and_utility(case):
+    game = checkers.Checkers()
+    board = setup_position(game, case["to_move"], case["placements"])
+    bitboard = Bitboard.from_squares(board.squares, board.to_move)
+
+    assert as_lists(bitboard.captures) == as_lists(board.captures)
+    assert as_lists(bitboard.moves) == as_lists(board.moves)
+    assert bitboard.utility(BLACK) == board.utility(BLACK)
+    assert bitboard.utility(WHITE) == board.utility(WHITE)
+
+
+@pytest.mark.parametrize("case", POSITIONS, ids=lambda c: c["name"])
+def test_bitboard_perft_matches_checkerboard(case):
+    game = checkers.Checkers()
+    board = setup_position(game, case["to_move"], case["placements"])
+    bit_game = checkers.Checkers(bitboard=True)
+    bit_game.curr_state = Bitboard.from_squares(board.squares, board.to_move)
+
+    assert bit_game.perft(4) == game.perft(4, board)
+
+
+def test_bitboard_start_position_perft():
+    game = checkers.Checkers(bitboard=True)
+    assert [game.perft(d) for d in range(1, 6)] == [7, 49, 302, 1469, 7361]
+
+
+def test_bitboard_make_undo_roundtrip_over_random_games():
+    rng = random.Random(7)
+    for _ in range(20):
+        game = checkers.Checkers()
+        board = game.curr_state
+        for _ in range(60):
+            bitboard = Bitboard.from_squares(board.squares, board.to_move)
+            assert as_lists(bitboard.captures) == as_lists(board.captures)
+            assert as_lists(bitboard.moves) == as_lists(board.moves)
+            before = (bitboard.black, bitboard.white, bitboard.kings, bitboard.to_move)
+            moves = game.legal_moves(board)
+            if not moves:
+                break
+            for mv in game.legal_moves(bitboard):
+                bitboard.make_move(mv, notify=False, undo=False)
+                bitboard.undo_move(mv, notify=False, redo=False)
+                assert (bitboard.black, bitboard.white, bitboard.kings, bitboard.to_move) == before
+            board.make_move(rng.choice(moves), notify=False, undo=False)
+
+
+def test_quiet_move_count_matches_generated_moves():
+    rng = random.Random(11)
+    game = checkers.Checkers()
+    board = game.curr_state
+    for _ in range(80):
+        black, white, kings = board.bitmasks()
+        own = black if board.to_move == BLACK else white
+        empty = ~(black | white) & FULL_MASK
+        assert quiet_move_count(board.to_move, own, kings, empty) == len(board.moves)
+        moves = game.legal_moves(board)
+        if not moves:
+            break
+        board.make_move(rng.choice(moves), notify=False, undo=False)
+
+
+def test_unrolled_shifts_match_shift():
+    rng = random.Random(3)
+    unrolled = {-6: _from_minus_6, -5: _from_minus_5, 5: _from_plus_5, 6: _from_plus_6}
+    for _ in range(200):
+        bb = rng.getrandbits(32)
+        for step, from_step in unrolled.items():
+            assert from_step(bb) == shift(bb, -step)
+
+
+def test_bit_moves_convert_to_and_from_squares():
+    rng = random.Random(5)
+    game = checkers.Checkers(bitboard=True)
+    board = game.curr_state
+    for _ in range(80):
+        moves = game.legal_moves(board)
+        if not moves:
+            break
+        for mv in moves:
+            move = Move(mv.squares)
+            assert BitMove.from_move(move) == mv
+            assert (mv.origin, mv.destination, mv.jumps, mv.crowns) == (
+                move.origin,
+                move.destination,
+                move.jumps,
+                move.crowns,
+            )
+            key = board.hash_key ^ mv.key_delta ^ SIDE_KEY  # the side to move flips too
+            board.push_move(mv)
+            assert board.hash_key == key == Bitboard.from_squares(board.squares, board.to_move).hash_key
+            board.pop_move()
+        board.make_move(rng.choice(moves), notify=False, undo=False)
+
+
+@pytest.mark.parametrize("with_key", [False, True])
+def test_checkerboard_keeps_its_masks_through_make_push_and_pop(with_key):
+    rng = random.Random(13)
+    game = checkers.Checkers()
+    board = game.curr_state
+    if with_key:
+        game.hash_key()  # start the key, which the masks are then kept up alongside
+    for _ in range(60):
+        moves = game.legal_moves(board)
+        if not moves:
+            break
+        for mv in moves:
+            board.push_move(mv)
+            bitboard = Bitboard.from_squares(board.squares, board.to_move)
+            assert board.bitmasks() == (bitboard.black, bitboard.white, bitboard.kings)
+            board.pop_move()
+        mv = rng.choice(moves)
+        board.make_move(mv, notify=False, undo=False)
+        board.undo_move(mv, notify=False, redo=False)
+        board.make_move(mv, notify=False, undo=False)
+        bitboard = Bitboard.from_squares(board.squares, board.to_move)
+        assert board.bitmasks() == (bitboard.black, bitboard.white, bitboard.kings)
+    assert (board._key is not None) == with_key
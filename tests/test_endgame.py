@@ -0,0 +1,152 @@
+import os
+
+import pytest
+
+import game.checkers as checkers
+from ai.endgame import (
+    EndgameDatabase,
+    EndgameTable,
+    loss_value,
+    main,
+    material_of,
+    materials,
+    mirror,
+    solve,
+    value_plies,
+    win_value,
+)
+from ai.engine import WIN_BOUND, Engine
+from game.bitboard import Bitboard
+from game.perftsuite import position_from_fen
+from util.globalconst import BLACK, WHITE, WIN_SCORE, keymap
+
+
+@pytest.fixture(scope="module")
+def database():
+    """Every table of two pieces, and two kings against one both ways round."""
+    tables = {}
+    for material in materials(2):
+        tables[material] = solve(material, tables)
+    tables[2, 0, 1, 0] = solve((2, 0, 1, 0), tables)
+    tables[1, 0, 2, 0] = mirror(tables[2, 0, 1, 0])
+    return EndgameDatabase(tables.values())
+
+
+def test_materials_come_after_those_they_lead_into():
+    order = list(materials(4))
+    assert len(order) == len(set(order))
+    assert order[0] == (1, 0, 1, 0)
+    for i, (bk, bm, wk, wm) in enumerate(order):
+        assert bk + bm and wk + wm and bk + bm + wk + wm <= 4
+        if bm:  # a black man crowning
+            assert order.index((bk + 1, bm - 1, wk, wm)) < i
+        if wk + wm > 1 and wk:  # a white king captured
+            assert order.index((bk, bm, wk - 1, wm)) < i
+
+
+@pytest.mark.parametrize("material", [(1, 0, 1, 0), (0, 1, 0, 1), (1, 1, 0, 1), (0, 2, 1, 0), (1, 0, 2, 0)])
+def test_index_and_position_are_inverses(material):
+    table = EndgameTable(material)
+    positions = 0
+    for idx in range(table.size):
+        position = table.position(idx)
+        if position is None:
+            continue
+        positions += 1
+        black, white, kings, _ = position
+        assert not black & white
+        assert material_of(black, white, kings) == material
+        assert table.index(*position) == idx
+    assert positions > table.size * 0.9
+
+
+def test_values_agree_with_the_moves(database):
+    """Each position is worth what its best move leads to, a ply further on."""
+    game = checkers.Checkers(bitboard=True)
+    board = game.curr_state
+    for table in database.tables.values():
+        for idx, value in enumerate(table.values):
+            position = table.position(idx)
+            if position is None:
+                continue
+            board.set_bitmasks(*position)
+            after = []
+            for move in game.legal_moves(board):
+                board.push_move(move)
+                black, white, _ = board.bitmasks()
+                after.append(database.probe(board) if black and white else loss_value(0))
+                board.pop_move()
+            if not after:
+                assert value == loss_value(0)
+            elif min(after) < 0:
+                assert value == win_value(min(value_plies(v) for v in after if v < 0) + 1)
+            elif min(after) > 0:
+                assert value == loss_value(max(after) + 1)
+            else:
+                assert value == 0
+
+
+def test_known_endings(database):
+    kings = database.tables[1, 0, 1, 0]
+    assert {value > 0 for value in kings.values} == {True, False}  # a king can be trapped, but most positions draw
+    game = checkers.Checkers()
+    board = game.curr_state
+    # the white king in the corner at a1, whose only way out is jumped by the black king on c3
+    board.set_position(*position_from_fen(f"W:WK{keymap[6]}:BK{keymap[18]}"))
+    assert database.probe(board) == loss_value(2)
+    board.set_position(*position_from_fen(f"B:WK{keymap[6]}:BK{keymap[18]},K{keymap[24]}"))
+    assert database.probe(board) > 0
+
+
+def test_mirrored_table_is_the_solved_one(database):
+    tables = {material: table for material, table in database.tables.items() if sum(material) == 2}
+    assert solve((1, 0, 2, 0), tables).values == database.tables[1, 0, 2, 0].values
+    for material in ((1, 0, 0, 1), (0, 1, 0, 1)):
+        bk, bm, wk, wm = material
+        assert mirror(database.tables[material]).values == database.tables[wk, wm, bk, bm].values
+
+
+def test_save_and_load(database, tmp_path):
+    database.save(tmp_path)
+    assert "2010.edb" in os.listdir(tmp_path)
+    loaded = EndgameDatabase.load(tmp_path)
+    assert loaded.max_pieces == 3
+    assert {material: table.values for material, table in loaded.tables.items()} == {
+        material: table.values for material, table in database.tables.items()
+    }
+
+
+def test_piece_count_on_either_board():
+    for bitboard in (False, True):
+        game = checkers.Checkers(bitboard=bitboard)
+        board = game.curr_state
+        board.set_position(*position_from_fen("W:W18,K30:B14,K22"))
+        assert board.piece_count == 4
+        board.push_move(game.legal_moves(board)[0])  # 18x9
+        assert board.piece_count == 3
+        board.pop_move()
+        assert board.piece_count == 4
+
+
+def test_engine_plays_the_longest_win_out(database):
+    two_kings = database.tables[2, 0, 1, 0]
+    idx = max(range(0, two_kings.size, 2), key=lambda i: two_kings.values[i])
+    plies = two_kings.values[idx]
+    assert WIN_SCORE - plies > WIN_BOUND
+    game = checkers.Checkers()
+    board = game.curr_state
+    bitboard = Bitboard()
+    bitboard.set_bitmasks(*two_kings.position(idx))
+    board.set_position(bitboard.squares, BLACK)
+    engine = Engine(game, endgames=database)
+    assert engine.search(board, 1).score == WIN_SCORE - plies
+    for _ in range(plies):
+        board.make_move(engine.search(board, 1).move, notify=False, undo=False)
+    assert board.to_move == WHITE
+    assert not game.legal_moves(board)
+
+
+def test_main_builds_and_saves(tmp_path, capsys):
+    main(["--pieces", "2", "--out", str(tmp_path)])
+    assert sorted(os.listdir(tmp_path)) == ["0101.edb", "0110.edb", "1001.edb", "1010.edb"]
+    assert "1010: 1984 slots" in capsys.readouterr().out
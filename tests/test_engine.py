@@ -0,0 +1,131 @@
+import pytest
+
+import game.checkers as checkers
+from ai.engine import Engine
+from ai.timecontrol import TimeControl
+from util.globalconst import BLACK, KING, MAN, WHITE, WIN_SCORE
+
+
+def negamax(game, state, depth, ply=0):
+    """Reference search: full width to depth, then every capture sequence to the end."""
+    moves = game.legal_moves(state)
+    if not moves:
+        return -WIN_SCORE + ply
+    if depth <= 0 and not moves[0].jumps:
+        return state.utility(state.to_move)
+    best = -WIN_SCORE
+    for move in moves:
+        state.push_move(move)
+        best = max(best, -negamax(game, state, depth - 1, ply + 1))
+        state.pop_move()
+    return best
+
+
+def exact_engine(game):
+    """An engine without the selective search, which returns the same scores as negamax."""
+    return Engine(game, lmr=False, futility=False)
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3, 4])
+def test_pvs_score_matches_plain_negamax(depth):
+    game = checkers.Checkers()
+    expected = negamax(game, game.curr_state, depth)
+
+    result = exact_engine(game).search(game.curr_state, depth)
+
+    assert result.score == expected
+    assert result.depth == depth
+
+
+def test_principal_variation_is_playable_and_starts_with_the_move():
+    game = checkers.Checkers()
+    engine = Engine(game)
+    score = None
+    for depth in range(1, 7):
+        result = engine.search(game.curr_state, depth, score)
+        score = result.score
+    board = game.curr_state
+    squares = list(board.squares)
+
+    assert result.pv[0] == result.move
+    assert len(result.pv) == 6
+    for move in result.pv:
+        assert move in game.legal_moves(board)
+        board.push_move(move)
+    for _ in result.pv:
+        board.pop_move()
+    assert board.squares == squares
+
+
+def test_aspiration_window_gives_the_full_window_score():
+    game = checkers.Checkers()
+    full = exact_engine(game).search(game.curr_state, 5).score
+
+    # previous scores well away from the true one force re-searches on either side
+    assert exact_engine(game).search(game.curr_state, 5, full + 500).score == full
+    assert exact_engine(game).search(game.curr_state, 5, full - 500).score == full
+
+
+def test_engine_finds_a_forced_win():
+    game = checkers.Checkers()
+    board = game.curr_state
+    board.clear()
+    board.to_move = WHITE
+    # the lone black king on square 6 is trapped by two white kings
+    board.squares[6] = BLACK | KING
+    board.squares[18] = WHITE | KING
+    board.squares[12] = WHITE | KING
+
+    result = Engine(game).search(board, 4)
+
+    assert result.score > WIN_SCORE - 10
+
+
+def test_quiescence_sees_the_capture_beyond_the_horizon():
+    game = checkers.Checkers()
+    board = game.curr_state
+    board.clear()
+    board.to_move = BLACK
+    board.squares[7] = BLACK | MAN
+    board.squares[17] = BLACK | MAN  # its only move, to 23, is answered by 29x17
+    board.squares[29] = WHITE | MAN
+
+    result = exact_engine(game).search(board, 1)
+
+    assert result.move.origin == 7
+    assert result.score == negamax(game, board, 1)
+
+
+def test_iterate_returns_the_deepest_completed_search():
+    game = checkers.Checkers()
+
+    result = exact_engine(game).iterate(game.curr_state, TimeControl.fixed_depth(4))
+
+    assert result.depth == 4
+    assert result.score == negamax(game, game.curr_state, 4)
+    assert Engine(game).iterate(game.curr_state, TimeControl.fixed_depth(4, stop=lambda: True)).depth == 1
+
+
+def test_iterate_stops_at_once_with_a_single_legal_move():
+    game = checkers.Checkers()
+    board = game.curr_state
+    board.clear()
+    board.to_move = BLACK
+    board.squares[17] = BLACK | MAN
+    board.squares[42] = WHITE | MAN
+
+    result = Engine(game).iterate(board, TimeControl.fixed_depth(6))
+
+    assert (result.depth, result.move.destination) == (1, 23)
+
+
+@pytest.mark.parametrize("lmr, futility", [(True, False), (False, True), (True, True)])
+def test_selective_search_cuts_nodes_but_not_the_score(lmr, futility):
+    game = checkers.Checkers()
+    game.curr_state.make_move(game.legal_moves()[0], notify=False, undo=False)
+    exact = exact_engine(game).iterate(game.curr_state, TimeControl.fixed_depth(8))
+
+    result = Engine(game, lmr=lmr, futility=futility).iterate(game.curr_state, TimeControl.fixed_depth(8))
+
+    assert result.nodes < exact.nodes
+    assert result.score == exact.score
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+import game.checkers as checkers
+from game.evalcache import EvalCache
+from util.globalconst import BLACK, WHITE
+
+
+def test_cache_counts_hits_and_misses_and_overwrites_on_collision():
+    cache = EvalCache(10)
+    assert len(cache) == 16
+
+    assert cache.probe(5) is None
+    cache.store(5, -12.5)
+    assert cache.probe(5) == -12.5
+    cache.store(5 + 16, 7)  # same slot
+    assert cache.probe(5) is None
+    assert cache.probe(5 + 16) == 7
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    cache.clear()
+    assert (cache.probe(5 + 16), cache.hits, cache.misses) == (None, 0, 1)
+
+
+def test_cached_utility_scores_as_the_uncached_one():
+    rng = random.Random(4)
+    game = checkers.Checkers(eval_cache_size=1 << 10)
+    board = game.curr_state
+    plain = checkers.Checkers().curr_state
+    for _ in range(3):
+        for _ in range(60):
+            moves = game.legal_moves()
+            if not moves:
+                break
+            plain.set_position(board.squares, board.to_move)
+            for player in (BLACK, WHITE, BLACK):
+                assert board.utility(player) == plain.utility(player)
+            board.make_move(rng.choice(moves), notify=False, undo=False)
+        board.set_position(checkers.Checkers().curr_state.squares, BLACK)
+
+    assert board.eval_cache.hits > 0
+    assert board.eval_cache.misses > 0
+
+
+def test_a_bitboard_game_refuses_an_eval_cache():
+    with pytest.raises(ValueError):
+        checkers.Checkers(bitboard=True, eval_cache_size=1 << 10)
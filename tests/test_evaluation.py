@@ -0,0 +1,64 @@
+import random
+
+import game.checkers as checkers
+from game.benchmark import bench_eval
+from game.bitboard import Bitboard
+from util.globalconst import BLACK, KING, MAN, WHITE
+
+
+def test_incremental_utility_matches_a_full_scan_through_make_push_and_pop():
+    rng = random.Random(11)
+    for _ in range(20):
+        game = checkers.Checkers()
+        board = game.curr_state
+        pushed = 0
+        for _ in range(100):
+            moves = game.legal_moves(board)
+            if not moves:
+                break
+            for player in (BLACK, WHITE):
+                assert board.utility(player) == board.scan_utility(player)
+            if pushed and rng.random() < 0.3:
+                board.pop_move()
+                pushed -= 1
+            elif pushed or rng.random() < 0.5:
+                board.push_move(rng.choice(moves))
+                pushed += 1
+            else:
+                board.make_move(rng.choice(moves), notify=False, undo=False)
+
+
+def test_utility_of_a_position_set_up_after_clear():
+    board = checkers.Checkers().curr_state
+    board.utility(BLACK)
+    board.clear()
+    board.to_move = WHITE
+    board.squares[18] = WHITE | KING
+    board.squares[30] = WHITE | KING
+    board.squares[7] = BLACK | KING
+    board.squares[41] = BLACK | MAN
+
+    for player in (BLACK, WHITE):
+        assert board.utility(player) == board.scan_utility(player)
+
+
+def test_table_driven_scan_scores_as_the_bitboard_does():
+    rng = random.Random(12)
+    for _ in range(10):
+        game = checkers.Checkers()
+        board = game.curr_state
+        for _ in range(100):
+            moves = game.legal_moves(board)
+            if not moves:
+                break
+            bitboard = Bitboard.from_squares(board.squares, board.to_move)
+            for player in (BLACK, WHITE):
+                assert board.scan_utility(player) == bitboard.utility(player)
+            board.make_move(rng.choice(moves), notify=False, undo=False)
+
+
+def test_eval_benchmark_times_all_three_methods():
+    timings = bench_eval(count=50, repeat=1)
+
+    assert sorted(timings) == ["bitboard", "incremental", "scan"]
+    assert all(seconds > 0 for seconds in timings.values())
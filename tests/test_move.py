@@ -0,0 +1,63 @@
+import pickle
+
+import pytest
+
+import game.checkers as checkers
+from base.move import Move
+from util.globalconst import BLACK, FREE, KING, MAN, WHITE
+
+
+def test_move_converts_losslessly_between_list_and_tuple_forms():
+    affected = [[6, BLACK | MAN, FREE], [12, WHITE | MAN, FREE], [18, FREE, BLACK | MAN]]
+    move = Move(affected, "note")
+
+    assert move.squares == ((6, BLACK | MAN, FREE), (12, WHITE | MAN, FREE), (18, FREE, BLACK | MAN))
+    assert move.affected_squares == affected
+    assert Move(move.affected_squares) == move
+    assert move.annotation == "note"
+
+
+def test_move_affected_squares_is_a_copy():
+    move = Move([[39, BLACK | MAN, FREE], [45, FREE, BLACK | KING]])
+    move.affected_squares[1][2] = FREE
+
+    assert move.squares[1] == (45, FREE, BLACK | KING)
+    with pytest.raises(AttributeError):
+        move.squares = ()
+
+
+def test_equal_moves_hash_alike_regardless_of_annotation():
+    a = Move([[17, BLACK | MAN, FREE], [23, FREE, BLACK | MAN]], "first")
+    b = Move.from_tuples(((17, BLACK | MAN, FREE), (23, FREE, BLACK | MAN)), "second")
+    c = Move([[18, BLACK | MAN, FREE], [23, FREE, BLACK | MAN]])
+
+    assert a == b
+    assert hash(a) == hash(b)
+    assert a != c
+    assert len({a, b, c}) == 2
+
+
+def test_move_properties():
+    quiet = Move([[15, WHITE | MAN, FREE], [9, FREE, WHITE | KING]])
+    double = Move(
+        [
+            [6, BLACK | MAN, FREE],
+            [12, WHITE | MAN, FREE],
+            [18, FREE, FREE],
+            [23, WHITE | MAN, FREE],
+            [28, FREE, BLACK | MAN],
+        ]
+    )
+
+    assert (quiet.origin, quiet.destination, quiet.jumps) == (15, 9, 0)
+    assert (double.origin, double.destination, double.jumps) == (6, 28, 2)
+
+
+def test_generated_moves_survive_pickling():
+    game = checkers.Checkers()
+    moves = game.legal_moves()
+
+    restored = pickle.loads(pickle.dumps(moves))
+
+    assert restored == moves
+    assert [hash(m) for m in restored] == [hash(m) for m in moves]
@@ -0,0 +1,56 @@
+import game.checkers as checkers
+from ai.ordering import MoveOrderer
+from base.move import Move
+from util.globalconst import BLACK, FREE, MAN, WHITE
+
+
+def quiet(src, dest):
+    return Move([[src, BLACK | MAN, FREE], [dest, FREE, BLACK | MAN]])
+
+
+def test_captures_are_sorted_by_length_after_the_hash_move():
+    single = Move([[6, BLACK | MAN, FREE], [12, WHITE | MAN, FREE], [18, FREE, BLACK | MAN]])
+    double = Move(
+        [
+            [7, BLACK | MAN, FREE],
+            [12, WHITE | MAN, FREE],
+            [17, FREE, FREE],
+            [23, WHITE | MAN, FREE],
+            [29, FREE, BLACK | MAN],
+        ]
+    )
+    other = Move([[8, BLACK | MAN, FREE], [14, WHITE | MAN, FREE], [20, FREE, BLACK | MAN]])
+    orderer = MoveOrderer()
+
+    assert orderer.order([single, double, other], 0, BLACK) == [double, single, other]
+    assert orderer.order([single, double, other], 0, BLACK, other) == [other, double, single]
+
+
+def test_killers_come_before_history_then_reset_clears_both():
+    a, b, c, d = quiet(12, 17), quiet(13, 18), quiet(14, 19), quiet(15, 20)
+    orderer = MoveOrderer()
+    orderer.cutoff(d, 1, 4, BLACK)  # the best history score ...
+    orderer.cutoff(c, 2, 1, BLACK)
+    orderer.cutoff(b, 2, 1, BLACK)  # ... but b and c are the killers at ply 2
+
+    assert orderer.order([a, b, c, d], 2, BLACK) == [b, c, d, a]
+    assert orderer.order([a, b, c, d], 3, BLACK) == [d, b, c, a]
+    assert orderer.order([a, b, c, d], 3, WHITE) == [a, b, c, d]
+    assert orderer.order([a, b, c, d], 2, BLACK, a) == [a, b, c, d]
+
+    orderer.reset()
+    assert orderer.order([d, c, b, a], 2, BLACK) == [d, c, b, a]
+
+
+def test_order_leaves_the_generated_list_alone():
+    game = checkers.Checkers()
+    moves = game.legal_moves()
+    before = list(moves)
+    orderer = MoveOrderer()
+    orderer.cutoff(moves[-1], 0, 3, BLACK)
+
+    ordered = orderer.order(moves, 0, BLACK, moves[2])
+
+    assert moves == before
+    assert sorted(map(repr, ordered)) == sorted(map(repr, moves))
+    assert ordered[:2] == [moves[2], moves[-1]]
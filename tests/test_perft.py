@@ -0,0 +1,120 @@
+import random
+
+import game.checkers as checkers
+from game.benchmark import bench_movegen
+from game.perft import PerftTable, _split, divide, main, move_text, parallel_perft, perft
+from util.globalconst import BLACK, KING, MAN, WHITE
+
+
+def king_ending():
+    game = checkers.Checkers()
+    board = game.curr_state
+    board.clear()
+    board.to_move = WHITE
+    board.squares[18] = WHITE | KING
+    board.squares[30] = WHITE | KING
+    board.squares[36] = WHITE | MAN
+    board.squares[7] = BLACK | KING
+    board.squares[24] = BLACK | MAN
+    board.squares[41] = BLACK | MAN
+    return game
+
+
+def test_table_stores_counts_by_position_and_depth():
+    table = PerftTable(10)
+    assert len(table) == 16
+
+    table.store(12345, 3, 10**12)
+    assert table.probe(12345, 3) == 10**12
+    assert table.probe(12345, 2) is None
+    table.store(12345 + 16, 3, 7)  # same slot
+    assert table.probe(12345, 3) is None
+    assert (table.probes, table.hits) == (3, 1)
+
+
+def test_hashed_perft_counts_as_the_plain_one():
+    for game in (checkers.Checkers(), king_ending()):
+        squares = list(game.curr_state.squares)
+        table = PerftTable(1 << 10)  # small enough to overwrite entries
+        for depth in range(7):
+            assert perft(game, depth, table=table) == game.perft(depth)
+        assert game.curr_state.squares == squares
+
+
+def test_legal_move_count_over_random_games():
+    rng = random.Random(8)
+    for bitboard in (False, True):
+        game = checkers.Checkers(bitboard=bitboard)
+        for _ in range(100):
+            moves = game.legal_moves()
+            assert game.legal_move_count() == len(moves)
+            if not moves:
+                break
+            game.make_move(rng.choice(moves), notify=False, undo=False)
+
+
+def test_bulk_counting_counts_as_playing_the_last_ply():
+    for game in (checkers.Checkers(), king_ending(), checkers.Checkers(bitboard=True)):
+        for depth in range(6):
+            assert perft(game, depth, bulk=True) == game.perft(depth)
+            assert perft(game, depth, table=PerftTable(1 << 10), bulk=True) == game.perft(depth)
+
+
+def test_parallel_perft_counts_as_the_plain_one():
+    game = king_ending()
+    squares = list(game.curr_state.squares)
+
+    assert parallel_perft(game, 5, workers=2, split_depth=2, table_size=1 << 10) == game.perft(5)
+    assert parallel_perft(game, 1, workers=2) == game.perft(1)  # shallower than the split
+    assert game.curr_state.squares == squares
+
+    bit_game = checkers.Checkers(bitboard=True)
+    assert parallel_perft(bit_game, 5, workers=2, table_size=0) == 7361
+
+
+def test_split_tells_positions_apart_even_if_their_keys_collide(monkeypatch):
+    game = checkers.Checkers()
+    frontier = {}
+    monkeypatch.setattr(checkers.Checkerboard, "hash_key", property(lambda self: 0))
+    _split(game.legal_moves, game.curr_state, 2, frontier)
+
+    assert sum(frontier.values()) == game.perft(2) == 49
+    assert len(frontier) == 49  # no two orders of two moves reach the same position
+
+
+def test_divide_adds_up_to_the_perft():
+    game = checkers.Checkers()
+    counts = divide(game, 4, table=PerftTable(1 << 10))
+
+    assert [move_text(move) for move, _ in counts] == ["12-16", "11-16", "11-15", "10-15", "10-14", "9-14", "9-13"]
+    assert sum(count for _, count in counts) == 1469
+
+
+def test_move_text_lists_every_landing_square_of_a_jump():
+    game = checkers.Checkers()
+    board = game.curr_state
+    board.clear()
+    board.to_move = BLACK
+    board.squares[6] = BLACK | MAN
+    board.squares[12] = WHITE | MAN
+    board.squares[23] = WHITE | MAN
+
+    assert [move_text(move) for move in game.legal_moves()] == ["4x11x20"]
+
+
+def test_command_line_divide(capsys):
+    main(["3", "--divide", "--table-size", "1024"])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("Perft for depth 1: 7.")
+    assert lines[1].startswith("Perft for depth 2: 49.")
+    assert lines[2].split() == ["12-16", "47"]
+    assert len(lines) == 2 + 7 + 1
+    assert lines[-1].startswith("Perft for depth 3: 302.")
+
+
+def test_movegen_benchmark_rates_all_four_methods():
+    rates = bench_movegen(count=50, repeat=1)
+
+    assert sorted(rates) == ["bitboard", "bitboard count", "checkerboard", "checkerboard count"]
+    assert all(rate > 0 for rate in rates.values())
@@ -0,0 +1,51 @@
+import json
+
+import game.checkers as checkers
+from game.perftsuite import SUITE, SuitePosition, main, position_from_fen, run_suite, summarize
+from util.globalconst import BLACK, KING, MAN, WHITE, square_map
+
+
+def test_fen_of_the_start_position():
+    squares, to_move = position_from_fen(SUITE[0].fen)
+
+    assert (squares, to_move) == (checkers.Checkers().curr_state.squares, BLACK)
+
+
+def test_fen_with_kings():
+    squares, to_move = position_from_fen("W:WK18,22:BK5")
+
+    assert to_move == WHITE
+    assert squares[square_map[18]] == WHITE | KING
+    assert squares[square_map[22]] == WHITE | MAN
+    assert squares[square_map[5]] == BLACK | KING
+    assert sum(1 for piece in squares if piece & (BLACK | WHITE)) == 3
+
+
+def test_suite_counts_agree_on_both_boards():
+    assert SUITE[0].counts[:5] == (7, 49, 302, 1469, 7361)
+    for bitboard in (False, True):
+        results = run_suite(max_depth=4, bitboard=bitboard, table_size=1 << 10)
+
+        assert len(results) == 4 * len(SUITE)
+        assert all(result["ok"] for result in results)
+        assert summarize(results)["failed"] == 0
+
+
+def test_a_wrong_count_fails_and_an_exhausted_budget_skips():
+    wrong = SuitePosition("wrong", SUITE[0].fen, (7, 50, 302))
+
+    results = run_suite(budget=60, positions=(wrong,), table_size=0, bulk=False)
+    assert [result["ok"] for result in results] == [True, False, True]
+
+    assert run_suite(budget=-1, positions=(wrong,)) == []
+
+
+def test_command_line_json_report(tmp_path):
+    path = tmp_path / "perft.json"
+
+    assert main(["--max-depth", "3", "--table-size", "1024", "--json", str(path)]) == 0
+    report = json.loads(path.read_text())
+    assert report["settings"]["max_depth"] == 3
+    assert report["summary"]["runs"] == 3 * len(SUITE)
+    assert report["summary"]["failed"] == 0
+    assert {result["position"] for result in report["results"]} == {position.name for position in SUITE}
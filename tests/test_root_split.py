@@ -0,0 +1,54 @@
+import ai.games as games
+import game.checkers as checkers
+from util.globalconst import BLACK, KING, MAN, WHITE
+
+
+def minimax(game, state, player, plies, maximize):
+    moves = game.legal_moves(state)
+    if plies == 0 or not moves:
+        return game.utility(player, state)
+    values = []
+    for move in moves:
+        state.push_move(move)
+        values.append(minimax(game, state, player, plies - 1, not maximize))
+        state.pop_move()
+    return max(values) if maximize else min(values)
+
+
+def root_values(game, state, d):
+    """Value of each root move as alphabeta_search(d) sees it: its replies are cut off below depth d."""
+    player = state.to_move
+    values = {}
+    for move in game.legal_moves(state):
+        state.push_move(move)
+        values[move] = minimax(game, state, player, d + 1, False)
+        state.pop_move()
+    return values
+
+
+def test_root_split_picks_a_best_root_move():
+    game = checkers.Checkers()
+    board = game.curr_state
+    squares = list(board.squares)
+
+    for d in (1, 2):
+        values = root_values(game, board, d)
+        move = games.alphabeta_search(board, game, d, workers=2)
+        assert values[move] == max(values.values())
+    assert board.squares == squares
+
+
+def test_root_split_in_a_king_ending():
+    game = checkers.Checkers()
+    board = game.curr_state
+    board.clear()
+    board.to_move = WHITE
+    board.squares[18] = WHITE | KING
+    board.squares[30] = WHITE | KING
+    board.squares[7] = BLACK | KING
+    board.squares[41] = BLACK | MAN
+
+    values = root_values(game, board, 1)
+    move = games.root_split_search(board, game, 1, workers=3)
+
+    assert values[move] == max(values.values())
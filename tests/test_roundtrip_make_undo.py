@@ -168,3 +168,44 @@ def test_make_undo_roundtrip_for_all_moves(case):
 
     # The actual round-trip check
     assert_roundtrip_for_all_legal_moves(game, board)
+
+
+@pytest.mark.parametrize("case", POSITIONS, ids=lambda c: c["name"])
+def test_push_pop_roundtrip_for_all_moves(case):
+    game = checkers.Checkers()
+    board = setup_position(game, case["to_move"], case["placements"])
+    before = snapshot(board)
+
+    for mv in game.legal_moves(board):
+        board.push_move(mv)
+        assert snapshot(board) != before, f"Move produced no state change: {mv.affected_squares}"
+        assert board.pop_move() is mv
+        assert snapshot(board) == before, f"push/pop failed round-trip for move: {mv.affected_squares}"
+
+
+def test_push_pop_restores_king_that_jumps_back_to_its_own_square():
+    game = checkers.Checkers()
+    board = setup_position(
+        game,
+        BLACK,
+        {13: BLACK | KING, 19: WHITE | MAN, 30: WHITE | MAN, 29: WHITE | MAN, 18: WHITE | MAN},
+    )
+    before = snapshot(board)
+
+    for mv in game.legal_moves(board):
+        assert mv.origin == mv.destination == 13
+        board.push_move(mv)
+        assert board.squares[13] == BLACK | KING
+        board.pop_move()
+        assert snapshot(board) == before
+
+
+def test_successors_leave_undo_and_redo_history_alone():
+    game = checkers.Checkers()
+    board = game.curr_state
+
+    for _ in game.successors(board):
+        pass
+
+    assert board.undo_list == []
+    assert board.redo_list == []
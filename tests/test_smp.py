@@ -0,0 +1,90 @@
+import pickle
+
+import game.checkers as checkers
+from ai.engine import Engine
+from ai.smp import LazySMP, lazy_smp_iterate
+from ai.timecontrol import TimeControl
+from ai.transposition import SharedTranspositionTable, TranspositionTable
+from util.globalconst import hashfBETA, hashfEXACT
+
+
+def test_shared_table_round_trips_entries_between_attached_copies():
+    game = checkers.Checkers()
+    moves = game.legal_moves()
+    tt = SharedTranspositionTable(64)
+    try:
+        attached = pickle.loads(pickle.dumps(tt))
+        tt.store(1234567, 6, hashfEXACT, -12.5, moves[3])
+        attached.store(1234567 + 64, 2, hashfBETA, 9999871, None)
+
+        entry = attached.probe(1234567, moves)
+        assert (entry.depth, entry.flag, entry.score, entry.move) == (6, hashfEXACT, -12.5, moves[3])
+        assert tt.probe(1234567).move is None  # no moves to find it among
+        assert tt.probe(1234567 + 64).score == 9999871
+        assert tt.probe(1234567 + 128) is None
+
+        attached.clear()
+        assert tt.probe(1234567) is None
+        attached.close()
+    finally:
+        tt.close()
+
+
+def test_engine_scores_agree_with_either_table():
+    game = checkers.Checkers()
+    tt = SharedTranspositionTable()
+    try:
+        for depth in range(1, 5):
+            shared = Engine(game, tt).search(game.curr_state, depth)
+            local = Engine(game, TranspositionTable()).search(game.curr_state, depth)
+            assert shared.score == local.score
+    finally:
+        tt.close()
+
+
+def test_lazy_smp_returns_a_main_search_result():
+    game = checkers.Checkers()
+    board = game.curr_state
+    squares = list(board.squares)
+
+    result = lazy_smp_iterate(game, board, TimeControl.fixed_depth(5), workers=2, tt_size=1 << 12)
+
+    assert result.depth == 5
+    assert result.move in game.legal_moves()
+    assert board.squares == squares
+
+
+def test_shared_table_posts_the_root_position():
+    tt = SharedTranspositionTable(64)
+    try:
+        attached = pickle.loads(pickle.dumps(tt))
+        assert attached.root() == (0, 0, 0, 0, 0)
+        tt.post_root(0xFFF, 0xFFF00000, 0x1, 2)
+        assert attached.root() == (1, 0xFFF, 0xFFF00000, 0x1, 2)
+        assert attached.root_count() == 1
+        attached.clear()  # empties the buckets, not the root
+        assert tt.root_count() == 1
+        attached.close()
+    finally:
+        tt.close()
+
+
+def test_lazy_smp_keeps_its_helpers_from_one_search_to_the_next():
+    game = checkers.Checkers()
+    board = game.curr_state
+    tt = SharedTranspositionTable(1 << 12)
+    smp = LazySMP(Engine(game, tt), workers=3)
+    try:
+        pids = [helper.pid for helper in smp._helpers]
+        assert len(pids) == 2
+        for _ in range(3):
+            result = smp.iterate(board, TimeControl.fixed_depth(4))
+            assert result.depth == 4
+            assert all(helper.is_alive() for helper in smp._helpers)
+            board.make_move(result.move, notify=False, undo=False)
+        assert [helper.pid for helper in smp._helpers] == pids
+        assert tt.root_count() == 3
+    finally:
+        smp.close()
+        tt.close()
+    assert not any(helper.is_alive() for helper in smp._helpers)
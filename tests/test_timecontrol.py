@@ -0,0 +1,66 @@
+import itertools
+import time
+
+import pytest
+
+import game.checkers as checkers
+from ai.engine import Engine
+from ai.timecontrol import SearchAborted, TimeControl
+
+
+def test_fixed_nodes_aborts_mid_depth_and_restores_the_board():
+    game = checkers.Checkers()
+    board = game.curr_state
+    squares, key = list(board.squares), board.hash_key
+
+    first = Engine(game).iterate(board, TimeControl.fixed_nodes(3000))
+    second = Engine(game).iterate(board, TimeControl.fixed_nodes(3000))
+
+    assert (board.squares, board.hash_key, board.search_ply) == (squares, key, 0)
+    assert (first.move, first.score, first.depth) == (second.move, second.score, second.depth)
+    assert first.move in game.legal_moves()
+    assert first.depth < Engine(game).iterate(board, TimeControl.fixed_nodes(20000)).depth
+
+
+def test_hard_limit_stops_the_search_on_time(monkeypatch):
+    # a clock that moves on 10 ms each time it is read, so the test doesn't depend on how fast the machine is
+    ticks = itertools.count()
+    monkeypatch.setattr(time, "perf_counter", lambda: next(ticks) * 0.01)
+    game = checkers.Checkers()
+    control = TimeControl(soft=10, hard=0.2, depth=None, poll_nodes=64)
+
+    result = Engine(game).iterate(game.curr_state, control)
+
+    # stopped at the first look at the clock past the hard limit, long before the soft one
+    assert 0.2 <= control.elapsed() < 0.5
+    assert result.move in game.legal_moves()
+
+
+def test_check_and_next_depth():
+    control = TimeControl(depth=3, nodes=100)
+    control.start()
+    control.check(99)
+    with pytest.raises(SearchAborted):
+        control.check(100)
+    assert control.next_depth(3, 0.0)
+    assert not control.next_depth(4, 0.0)
+
+    stopped = TimeControl.fixed_depth(8, stop=lambda: True)
+    assert not stopped.next_depth(2, 0.0)
+    with pytest.raises(SearchAborted):
+        stopped.check(0)
+
+    timed = TimeControl.fixed_time(5)
+    timed.start()
+    assert timed.next_depth(2, 1.0)
+    assert not timed.next_depth(2, 3.0)  # twice as long again would pass the hard limit
+
+
+def test_increment_budget_stays_within_the_clock():
+    control = TimeControl.increment(60, 2)
+
+    assert control.soft == pytest.approx(60 / 30 + 2)
+    assert control.hard == pytest.approx(16)
+    assert TimeControl.increment(10, 0).hard == pytest.approx(4 / 3)
+    low_on_time = TimeControl.increment(0.2, 1)
+    assert (low_on_time.soft, low_on_time.hard) == (pytest.approx(0.1), pytest.approx(0.1))
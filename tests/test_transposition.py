@@ -0,0 +1,57 @@
+import ai.games as games
+import game.checkers as checkers
+from ai.transposition import TranspositionTable
+from base.move import Move
+from util.globalconst import BLACK, FREE, MAN, hashfALPHA, hashfBETA, hashfEXACT
+
+
+def test_probe_returns_what_was_stored():
+    tt = TranspositionTable(100)
+    move = Move([[17, BLACK | MAN, FREE], [23, FREE, BLACK | MAN]])
+    tt.store(12345, 3, hashfEXACT, 1.5, move)
+
+    entry = tt.probe(12345)
+    assert len(tt) == 128
+    assert (entry.depth, entry.flag, entry.score, entry.move) == (3, hashfEXACT, 1.5, move)
+    assert tt.probe(12345 + 128) is None
+    assert (tt.probes, tt.hits) == (2, 1)
+
+
+def test_depth_preferred_bucket_keeps_the_deeper_entry():
+    tt = TranspositionTable(16)
+    deep, shallow, newer = 1, 1 + 16, 1 + 32
+    tt.store(deep, 5, hashfBETA, 10, None)
+    tt.store(shallow, 2, hashfALPHA, -10, None)
+    assert tt.probe(deep).depth == 5
+    assert tt.probe(shallow).depth == 2
+
+    # a shallower entry only ever takes the always-replace bucket
+    tt.store(newer, 1, hashfEXACT, 0, None)
+    assert tt.probe(deep).depth == 5
+    assert tt.probe(shallow) is None
+
+    # a deeper one takes over, and the entry it displaced moves to the other bucket
+    tt.store(newer, 7, hashfEXACT, 0, None)
+    assert tt.probe(newer).depth == 7
+    assert tt.probe(deep).depth == 5
+
+    tt.clear()
+    assert tt.probe(newer) is None
+
+
+def test_search_with_table_evaluates_fewer_positions():
+    def count_evals(tt):
+        game = checkers.Checkers()
+        evals = [0]
+
+        def eval_fn(st):
+            evals[0] += 1
+            return game.utility(BLACK, st)
+
+        for depth in range(1, 5):
+            move = games.alphabeta_search(game.curr_state, game, depth, eval_fn=eval_fn, tt=tt)
+        assert move in game.legal_moves()
+        assert game.curr_state.undo_list == []
+        return evals[0]
+
+    assert count_evals(TranspositionTable()) < count_evals(None)
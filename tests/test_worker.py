@@ -0,0 +1,172 @@
+import multiprocessing
+import time
+
+import pytest
+
+import ai.worker
+import game.checkers as checkers
+from ai.engine import Engine
+from ai.timecontrol import TimeControl
+from ai.worker import EngineWorker, _ponder, longest_of, shared_worker
+from util.globalconst import BLACK, MAN, WHITE
+
+
+def wait_for(worker, request_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        done, move = worker.result(request_id)
+        if done:
+            return move
+        time.sleep(0.01)
+    raise AssertionError("no reply from the engine worker")
+
+
+@pytest.fixture
+def worker():
+    worker = EngineWorker()
+    yield worker
+    worker.close()
+
+
+def test_worker_answers_searches_of_successive_positions(worker):
+    game = checkers.Checkers()
+    board = game.curr_state
+
+    for _ in range(3):
+        move = wait_for(worker, worker.search(board.squares, board.to_move, 0.2))
+        assert move in game.legal_moves()
+        board.make_move(move, notify=False, undo=False)
+
+    worker.new_game()
+    assert worker.process.is_alive()
+
+
+def test_stopped_search_replies_none_and_is_not_mistaken_for_the_next(worker):
+    game = checkers.Checkers()
+    board = game.curr_state
+
+    stale = worker.search(board.squares, board.to_move, 30)
+    worker.stop()
+    fresh = worker.search(board.squares, board.to_move, 0.1)
+
+    assert wait_for(worker, fresh) in game.legal_moves()
+    assert worker.result(stale) == (False, None)
+
+
+def test_worker_takes_the_longest_capture(worker):
+    game = checkers.Checkers()
+    board = game.curr_state
+    board.clear()
+    board.to_move = BLACK
+    board.squares[6] = BLACK | MAN
+    board.squares[12] = WHITE | MAN
+    board.squares[23] = WHITE | MAN
+    board.squares[13] = WHITE | MAN
+
+    move = wait_for(worker, worker.search(board.squares, board.to_move, 1))
+
+    assert move == longest_of(game.legal_moves())
+    assert move.jumps == 2
+
+
+def ponder_setup():
+    game = checkers.Checkers()
+    board = game.curr_state
+    engine = Engine(game)
+    pv = engine.iterate(board, TimeControl.fixed_depth(4)).pv
+    expected = checkers.Checkers()
+    for move in pv[:2]:
+        expected.curr_state.make_move(move, notify=False, undo=False)
+    return engine, board, pv, expected
+
+
+def test_ponder_hit_carries_on_with_the_requests_time_limit():
+    engine, board, pv, expected = ponder_setup()
+    here, there = multiprocessing.Pipe()
+    stop_event = multiprocessing.Event()
+    here.send(("search", 7, list(expected.curr_state.squares), expected.curr_state.to_move, 0.2, True))
+
+    start = time.time()
+    hit, pending = _ponder(engine, board, pv[:2], there, stop_event)
+
+    # a ponder search has no time limit of its own, so without the request's it would not stop
+    assert time.time() - start < 10
+    request_id, move, new_pv, ponder = hit
+    assert (request_id, ponder, pending) == (7, True, None)
+    assert move in expected.legal_moves()
+    assert new_pv[0] == move
+    # left at the position searched, to ponder the next reply from
+    assert (board.squares, board.to_move, board.search_ply) == (
+        expected.curr_state.squares,
+        expected.curr_state.to_move,
+        0,
+    )
+
+
+def test_ponder_hits_chain_from_one_reply_to_the_next():
+    engine, board, pv, expected = ponder_setup()
+    here, there = multiprocessing.Pipe()
+    stop_event = multiprocessing.Event()
+    for request_id in (7, 8, 9):
+        here.send(("search", request_id, list(expected.curr_state.squares), expected.curr_state.to_move, 0.2, True))
+        hit, pending = _ponder(engine, board, pv[:2], there, stop_event)
+        assert pending is None and hit[0] == request_id
+        _, move, pv, _ = hit
+        assert move in expected.legal_moves()
+        assert len(pv) > 1
+        for mv in pv[:2]:
+            expected.curr_state.make_move(mv, notify=False, undo=False)
+        assert board.squares != expected.curr_state.squares
+
+
+def test_ponder_hit_on_a_forced_capture_plays_the_longest(monkeypatch):
+    monkeypatch.setattr(ai.worker, "CAPTURE_DELAY", 0)
+    game = checkers.Checkers()
+    board = game.curr_state
+    # the first black move and white reply that leave black a capture
+    for ours in game.legal_moves():
+        board.push_move(ours)
+        for reply in game.legal_moves():
+            board.push_move(reply)
+            captures = board.captures
+            after = list(board.squares), board.to_move
+            board.pop_move()
+            if captures:
+                break
+        board.pop_move()
+        if captures:
+            break
+    line = [ours, reply]
+    here, there = multiprocessing.Pipe()
+    here.send(("search", 3, *after, 0.2, False))
+
+    hit, pending = _ponder(Engine(game), board, line, there, multiprocessing.Event())
+
+    assert hit == (3, longest_of(captures), [], False)
+
+
+def test_ponder_miss_hands_back_the_request():
+    engine, board, pv, expected = ponder_setup()
+    here, there = multiprocessing.Pipe()
+    stop_event = multiprocessing.Event()
+    request = ("search", 8, list(board.squares), board.to_move, 0.2, False)
+    here.send(request)
+
+    assert _ponder(engine, board, pv[:2], there, stop_event) == (None, request)
+
+    stop_event.set()
+    assert _ponder(engine, board, pv[:2], there, stop_event) == (None, None)
+
+
+def test_shared_worker_restarts_for_another_number_of_workers():
+    try:
+        first = shared_worker(1)
+        assert shared_worker(1) is first
+        second = shared_worker(2)
+        assert second is not first and second.workers == 2
+        assert not first.is_alive()
+        board = checkers.Checkers().curr_state
+        assert wait_for(second, second.search(board.squares, board.to_move, 0.1)) is not None
+    finally:
+        ai.worker._shared_worker.close()
+        ai.worker._shared_worker = None
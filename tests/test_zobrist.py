@@ -0,0 +1,70 @@
+import random
+
+import game.checkers as checkers
+from game.bitboard import Bitboard
+from game.zobrist import SIDE_KEY, move_delta, squares_key
+from util.globalconst import BLACK, WHITE
+
+
+def full_key(board):
+    key = squares_key(board.squares)
+    return key ^ SIDE_KEY if board.to_move == WHITE else key
+
+
+def test_incremental_key_matches_recomputed_key_over_random_games():
+    rng = random.Random(3)
+    for _ in range(10):
+        game = checkers.Checkers()
+        board = game.curr_state
+        bitboard = Bitboard.from_squares(board.squares, board.to_move)
+        assert board.hash_key == bitboard.hash_key
+        for _ in range(80):
+            moves = game.legal_moves(board)
+            if not moves:
+                break
+            mv = rng.choice(moves)
+            board.make_move(mv, notify=False, undo=False)
+            bitboard.make_move(mv, notify=False, undo=False)
+            assert board.hash_key == full_key(board)
+            assert bitboard.hash_key == board.hash_key
+
+
+def test_make_undo_and_push_pop_restore_the_key():
+    rng = random.Random(5)
+    game = checkers.Checkers()
+    board = game.curr_state
+    for _ in range(40):
+        before = board.hash_key
+        moves = game.legal_moves(board)
+        if not moves:
+            break
+        for mv in moves:
+            board.push_move(mv)
+            assert board.hash_key == before ^ move_delta(mv) ^ SIDE_KEY
+            board.pop_move()
+            assert board.hash_key == before
+            board.make_move(mv, notify=False, undo=False)
+            board.undo_move(mv, notify=False, redo=False)
+            assert board.hash_key == before
+        board.make_move(rng.choice(moves), notify=False, undo=False)
+
+
+def test_side_to_move_changes_the_key():
+    game = checkers.Checkers()
+    board = game.curr_state
+    black_key = board.hash_key
+    board.to_move = WHITE
+    assert board.hash_key == black_key ^ SIDE_KEY
+    board.to_move = BLACK
+    assert game.hash_key() == black_key
+
+
+def test_clear_resets_the_key_for_a_new_setup():
+    game = checkers.Checkers()
+    board = game.curr_state
+    start_key = board.hash_key
+    board.make_move(game.legal_moves()[0], notify=False, undo=False)
+    board.clear()
+    board.to_move = BLACK
+    board.squares[:] = checkers.Checkers().curr_state.squares
+    assert board.hash_key == start_key
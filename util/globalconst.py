@@ -135,6 +135,7 @@ OCCUPIED_CHAR = "-"
 
 INFINITY = 9999999
 MAX_DEPTH = 10
+MAX_PLY = 128  # deepest line the search-only move stack can hold
 VERSION = "0.7"
 TITLE = "Raven " + VERSION
 PROGRAM_TITLE = "Raven Checkers"
@@ -144,6 +145,21 @@ TRAINING_DIR = get_resource_path("training")
 # search values for transposition table
 hashfALPHA, hashfBETA, hashfEXACT = range(3)
 
+# constants for the checkers engine (ai/engine.py)
+WIN_SCORE = INFINITY - MAX_PLY  # score for a side that can no longer move, less one per ply to get there
+ASPIRATION_WINDOW = 25  # half-width of the window around the previous iteration's score
+SEARCH_WORKERS = 1  # processes a computer player searches with; more runs a Lazy SMP search
+PONDER = True  # computer players go on searching while their opponent thinks
+LMR = True  # late move reductions: search quiet moves ordered late less deeply
+LMR_MIN_DEPTH = 3  # remaining depth a node needs for its moves to be reduced
+LMR_MIN_MOVES = 3  # moves searched in full at a node before reductions start
+LMR_REDUCTION = 1  # plies taken off a reduced move
+FUTILITY = True  # futility pruning: skip quiet moves near the leaves that can't reach alpha
+FUTILITY_MARGINS = (0, 60, 120)  # by remaining depth; a man is worth 100
+EVAL_CACHE_SIZE = 1 << 16  # default size of an EvalCache (game/evalcache.py); the engine runs without one
+ENDGAME_PIECES = 4  # most pieces the endgame databases are built for (ai/endgame.py)
+ENDGAME_DIR = os.path.join(TRAINING_DIR, "endgames")  # where they are saved and loaded from
+
 # constants for evaluation function
 TURN = 2  # color to move gets + turn
 BRV = 3  # multiplier for back rank